@@ -0,0 +1,53 @@
+"""Measure what loading a background costs the frame that asks for it.
+
+Compares decoding the source PNG, as the game used to on the main thread,
+with decoding the JPEG variant picked for the window, and with the time
+load_async takes to hand back a LazyTexture. Also prints the size on disk
+of the source and the variant.
+
+Run with: python benchmarks/bench_backgrounds.py
+"""
+
+import os
+import statistics
+import time
+from pathlib import Path
+
+import arcade
+
+from quanta_quest.assets import background_path
+from quanta_quest.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from quanta_quest.sprites import TextureRegistry
+
+RUNS = 10
+SOURCE = Path(__file__).resolve().parent.parent / "resources" / "backgrounds" / "main.png"
+
+
+def median_ms(func):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    variant = background_path("main.png", SCREEN_WIDTH, SCREEN_HEIGHT)
+    print(f"source  {os.path.getsize(SOURCE) // 1024:6d} KB  "
+          f"decode {median_ms(lambda: arcade.load_texture(SOURCE)):7.2f} ms")
+    print(f"variant {os.path.getsize(variant) // 1024:6d} KB  "
+          f"decode {median_ms(lambda: arcade.load_texture(variant)):7.2f} ms")
+
+    samples = []
+    for _ in range(RUNS):
+        registry = TextureRegistry()
+        start = time.perf_counter()
+        lazy = registry.load_async(variant)
+        samples.append((time.perf_counter() - start) * 1000)
+        lazy.wait()
+    print(f"load_async returns after {statistics.median(samples):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
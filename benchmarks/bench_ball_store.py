@@ -0,0 +1,74 @@
+"""Measure puzzle checks on levels with 10, 100 and 1000 balls.
+
+Every second ball is the target of the ball before it and has a goal.
+The BallStore checks run as array expressions over the whole level; the
+same checks written as loops over the ball sprites are timed next to
+them. The linked pairs go through their LinkedStates one at a time, both
+when a gate is applied and when entanglement is checked.
+
+Run with: python benchmarks/bench_ball_store.py
+"""
+
+import timeit
+
+import numpy as np
+
+from quanta_quest.balls import ENTANGLED_STATE, BallStore
+from quanta_quest.constants import GRID_PIXEL_SIZE, PLAYER_START_Y
+from quanta_quest.levels import BallSpec, build_scene, load_level
+from quanta_quest.sprites import PlayerCharacter
+
+BALL_COUNTS = (10, 100, 1000)
+NUMBER = 200
+
+
+def make_level(ball_count):
+    base = load_level("main")
+    balls = tuple(
+        BallSpec(
+            state=i % 8,
+            x=(2 * i + 1) * GRID_PIXEL_SIZE,
+            y=PLAYER_START_Y + 30,
+            master=i - 1 if i % 2 else None,
+            goal=ENTANGLED_STATE if i % 2 else None,
+        )
+        for i in range(ball_count)
+    )
+    return base._replace(width=2 * ball_count + 2, balls=balls, init_ball=0)
+
+
+def loop_solved_mask(sprites):
+    return [ball.goal is None or ball.state == ball.goal for ball in sprites]
+
+
+def loop_entangled(sprites):
+    return [
+        ball for ball in sprites
+        if ball.master is not None
+        and ball.state == ENTANGLED_STATE
+        and ball.master.state == ENTANGLED_STATE
+    ]
+
+
+def per_us(func):
+    return timeit.timeit(func, number=NUMBER) / NUMBER * 1e6
+
+
+def main():
+    for ball_count in BALL_COUNTS:
+        level = make_level(ball_count)
+        store = BallStore(level.balls)
+        build_scene(level, PlayerCharacter(), store)
+        sprites = store.sprites
+        ids = np.arange(len(store))
+
+        print(f"{ball_count:5d} balls")
+        print(f"  solved mask     store {per_us(store.solved_mask):9.2f} us   "
+              f"loop {per_us(lambda: loop_solved_mask(sprites)):9.2f} us")
+        print(f"  entangled pairs store {per_us(store.entangled_mask):9.2f} us   "
+              f"loop {per_us(lambda: loop_entangled(sprites)):9.2f} us")
+        print(f"  H on every ball store {per_us(lambda: store.apply_gate(ids, 'H')):9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare gates_on_states with a loop of gate_on_state calls.
+
+Applies H to a row of balls and CNOT across ball pairs, for several batch
+sizes, and checks that both paths give the same result.
+
+Run with: python benchmarks/bench_batch_gates.py
+"""
+
+import time
+
+import numpy as np
+
+from quanta_quest.gate_manipulator import gate_on_state, gates_on_states
+
+SIZES = (100, 10_000, 1_000_000)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for size in SIZES:
+        states = rng.integers(8, size=size, dtype=np.int8)
+        masters = rng.integers(8, size=size, dtype=np.int8)
+
+        looped, loop_h = timed(lambda: [gate_on_state(s, "H") for s in states.tolist()])
+        batched, batch_h = timed(lambda: gates_on_states(states, "H"))
+        assert batched.tolist() == looped
+
+        looped, loop_c = timed(lambda: [
+            gate_on_state(s, "C", m) for s, m in zip(states.tolist(), masters.tolist())
+        ])
+        batched, batch_c = timed(lambda: gates_on_states(states, "C", masters))
+        assert batched.tolist() == looped
+
+        print(f"{size:9d} balls  H: loop {loop_h * 1e3:9.3f} ms  batch {batch_h * 1e3:7.3f} ms  "
+              f"({loop_h / batch_h:6.1f}x)   CNOT: loop {loop_c * 1e3:9.3f} ms  "
+              f"batch {batch_c * 1e3:7.3f} ms  ({loop_c / batch_c:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
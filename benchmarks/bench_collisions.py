@@ -0,0 +1,60 @@
+"""Measure player-vs-ball hit testing on levels with 10, 100 and 1000 balls.
+
+Each level stretches the main level to fit the balls two grid units apart.
+The player is swept across the map, and each step does one collision
+check against the spatially hashed "States" list from build_scene. The
+same check against a plain SpriteList shows the old linear scan.
+
+Run with: python benchmarks/bench_collisions.py
+"""
+
+import time
+
+import arcade
+
+from quanta_quest.constants import GRID_PIXEL_SIZE, PLAYER_START_Y
+from quanta_quest.levels import BallSpec, build_scene, load_level
+from quanta_quest.sprites import PlayerCharacter
+
+BALL_COUNTS = (10, 100, 1000)
+STEPS = 2000
+
+
+def make_level(ball_count):
+    base = load_level("main")
+    balls = tuple(
+        BallSpec(state=i % 8, x=(2 * i + 1) * GRID_PIXEL_SIZE, y=PLAYER_START_Y + 30)
+        for i in range(ball_count)
+    )
+    return base._replace(width=2 * ball_count + 2, balls=balls, init_ball=0)
+
+
+def time_checks(player, sprite_list, width):
+    hits = 0
+    start = time.perf_counter()
+    for step in range(STEPS):
+        player.center_x = width * step / STEPS
+        hits += len(arcade.check_for_collision_with_list(player, sprite_list))
+    return (time.perf_counter() - start) / STEPS * 1e6, hits
+
+
+def main():
+    for ball_count in BALL_COUNTS:
+        level = make_level(ball_count)
+        player = PlayerCharacter()
+        player.center_y = PLAYER_START_Y
+        scene = build_scene(level, player)
+        width = level.width * GRID_PIXEL_SIZE
+
+        plain = arcade.SpriteList()
+        plain.extend(scene["States"])
+
+        hashed_us, hashed_hits = time_checks(player, scene["States"], width)
+        plain_us, plain_hits = time_checks(player, plain, width)
+        assert hashed_hits == plain_hits
+        print(f"{ball_count:5d} balls  spatial hash {hashed_us:8.2f} us/check  "
+              f"linear scan {plain_us:8.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()
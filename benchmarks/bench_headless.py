@@ -0,0 +1,48 @@
+"""Measure headless simulation speed with a scripted walk through the level.
+
+The player walks right from the start to the exit sign, with every message
+box dismissed as it opens. No window or GPU is needed.
+
+Run with: python benchmarks/bench_headless.py
+"""
+
+import time
+
+import arcade
+
+from quanta_quest.engine import GameEngine, run_script
+
+RUNS = 5
+FRAMES = 5000
+
+# The intro message releases all keys, so walking right is pressed twice.
+WALK_RIGHT = [
+    (0, "key_press", arcade.key.RIGHT),
+    (5, "key_press", arcade.key.RIGHT),
+]
+
+
+def main():
+    start = time.perf_counter()
+    engine = GameEngine()
+    print(f"engine setup      {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    for _ in range(RUNS):
+        engine = GameEngine()
+        frames = 0
+
+        def count_frames(update=engine.update):
+            nonlocal frames
+            frames += 1
+            update()
+
+        engine.update = count_frames
+        start = time.perf_counter()
+        run_script(WALK_RIGHT, FRAMES, engine=engine)
+        elapsed = time.perf_counter() - start
+        print(f"{frames:5d} frames    {elapsed * 1000:8.2f} ms  "
+              f"{frames / elapsed:10.0f} frames/s  game over: {engine.game_over}")
+
+
+if __name__ == "__main__":
+    main()
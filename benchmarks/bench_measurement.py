@@ -0,0 +1,41 @@
+"""Compare sample_measurements with a loop of measure_state calls.
+
+Draws N shots of every superposition state both ways and reports the time
+per batch. The bulk path makes one binomial draw per state however many
+shots are asked for.
+
+Run with: python benchmarks/bench_measurement.py
+"""
+
+import time
+
+import numpy as np
+
+from quanta_quest.gate_manipulator import measure_state, sample_measurements
+
+SHOTS = (1_000, 100_000, 1_000_000)
+STATES = (4, 5, 6, 7)
+
+
+def main():
+    for shots in SHOTS:
+        rng = np.random.default_rng(0)
+        start = time.perf_counter()
+        for state in STATES:
+            outcomes = [measure_state(state, rng) for _ in range(shots)]
+            looped = outcomes.count(0)
+        loop_ms = (time.perf_counter() - start) * 1e3
+
+        rng = np.random.default_rng(0)
+        start = time.perf_counter()
+        counts = sample_measurements(STATES, shots, rng)
+        bulk_ms = (time.perf_counter() - start) * 1e3
+        assert counts.sum() == shots * len(STATES)
+        assert abs(looped - counts[-1, 0]) < 0.05 * shots
+
+        print(f"{shots:9d} shots x {len(STATES)} states  loop {loop_ms:10.3f} ms  "
+              f"bulk {bulk_ms:7.3f} ms  ({loop_ms / bulk_ms:8.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
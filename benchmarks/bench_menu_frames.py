@@ -0,0 +1,59 @@
+"""Measure per-frame draw time of the menu views.
+
+Opens a hidden window, shows each menu and times on_draw over a number of
+frames, waiting for the GPU to finish each one. For reference it also
+times one decode of the opening image, which the menus used to repeat on
+every frame. Needs a display (or a virtual one such as Xvfb).
+
+Run with: python benchmarks/bench_menu_frames.py
+"""
+
+import statistics
+import time
+
+import arcade
+
+from quanta_quest.assets import background_path
+from quanta_quest.constants import SCREEN_HEIGHT, SCREEN_TITLE, SCREEN_WIDTH
+from quanta_quest.views import GameOverView, MainMenu, PauseMenu
+
+FRAMES = 300
+BUDGET_MS = 16.0
+
+
+def time_frames(window, view):
+    window.show_view(view)
+    samples = []
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        view.on_draw()
+        window.ctx.finish()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, visible=False)
+
+    start = time.perf_counter()
+    arcade.load_texture(background_path("opening_cropped.png", SCREEN_WIDTH, SCREEN_HEIGHT))
+    decode_ms = (time.perf_counter() - start) * 1000
+    print(f"{'opening image decode':20s} {decode_ms:8.2f} ms (old per-frame cost)")
+
+    views = {
+        "MainMenu": MainMenu(),
+        "PauseMenu": PauseMenu(MainMenu()),
+        "GameOverView": GameOverView(),
+    }
+    for name, view in views.items():
+        samples = sorted(time_frames(window, view))
+        p95 = samples[int(len(samples) * 0.95)]
+        verdict = "ok" if p95 < BUDGET_MS else "OVER BUDGET"
+        print(f"{name:20s} median {statistics.median(samples):6.2f} ms  "
+              f"p95 {p95:6.2f} ms  max {samples[-1]:6.2f} ms  {verdict}")
+
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Measure cold import time of the game modules.
+
+Each sample runs a fresh interpreter so nothing is shared between runs.
+The qiskit import is timed on its own for comparison, since it used to be
+pulled in by gate_manipulator at startup.
+
+Run with: python benchmarks/bench_startup.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 5
+
+TARGETS = {
+    "quanta_quest.views": "import quanta_quest.views",
+    "qiskit (old startup cost)": "import qiskit.quantum_info",
+}
+
+
+def time_import(statement):
+    """Return the wall time in seconds of a fresh interpreter running statement."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    baseline = statistics.median(time_import("pass") for _ in range(RUNS))
+    print(f"{'interpreter':30s} {baseline * 1000:8.1f} ms")
+    for name, statement in TARGETS.items():
+        elapsed = statistics.median(time_import(statement) for _ in range(RUNS))
+        print(f"{name:30s} {(elapsed - baseline) * 1000:8.1f} ms")
+
+    check = "import sys, quanta_quest.views; print('qiskit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", check],
+                            check=True, capture_output=True, text=True)
+    print(f"qiskit loaded by views: {result.stdout.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure QubitRegister gate and measurement cost for 10-16 qubit puzzles.
+
+For each register size it applies a random mix of X/Z/H/S and CNOT gates
+and reports the time per gate, how many gates fit in one 60 fps frame
+(16.7 ms), and the cost of a Bell measurement and a full measurement.
+
+Run with: python benchmarks/bench_statevector.py
+"""
+
+import time
+
+import numpy as np
+
+from quanta_quest.statevector import QubitRegister
+
+QUBIT_COUNTS = (10, 12, 14, 16)
+GATES = 2000
+FRAME_MS = 1000 / 60
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for num_qubits in QUBIT_COUNTS:
+        register = QubitRegister(num_qubits, rng=rng)
+        names = rng.choice(["X", "Z", "H", "S", "C"], size=GATES)
+        targets = rng.integers(num_qubits, size=GATES)
+        offsets = rng.integers(1, num_qubits, size=GATES)
+
+        start = time.perf_counter()
+        for name, target, offset in zip(names, targets, offsets):
+            if name == "C":
+                register.cnot(int((target + offset) % num_qubits), int(target))
+            else:
+                register.apply_gate(str(name), int(target))
+        gate_us = (time.perf_counter() - start) / GATES * 1e6
+
+        start = time.perf_counter()
+        register.bell_measure(0, 1)
+        bell_us = (time.perf_counter() - start) * 1e6
+
+        start = time.perf_counter()
+        register.measure(tuple(range(num_qubits)))
+        measure_us = (time.perf_counter() - start) * 1e6
+
+        print(f"{num_qubits:2d} qubits  {gate_us:8.1f} us/gate  "
+              f"{FRAME_MS * 1000 / gate_us:8.0f} gates/frame  "
+              f"bell {bell_us:8.1f} us  measure all {measure_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
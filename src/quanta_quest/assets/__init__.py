@@ -1,10 +1,91 @@
-"""Asset path resolution for Quanta Quest."""
+"""Asset path resolution for Quanta Quest.
 
+Sprite images may also be packed into texture atlases by
+tools/build_atlas.py. Its manifest, atlas.json, maps each packed asset
+name to a region of an atlas image. Assets without a region, or every
+asset when no atlas has been built, load from their own files.
+
+Backgrounds come in several sizes made by tools/build_backgrounds.py and
+listed in backgrounds.json; background_path picks one for the window.
+"""
+
+import json
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 _ASSETS_DIR = Path(__file__).parent
 
+ATLAS_MANIFEST = "atlas.json"
+BACKGROUND_MANIFEST = "backgrounds.json"
+
+
+class AtlasRegion(NamedTuple):
+    image: str
+    x: int
+    y: int
+    width: int
+    height: int
+    scale: float
+
 
 def asset_path(name: str) -> str:
     """Return the absolute path to a game asset file."""
     return str(_ASSETS_DIR / name)
+
+
+@lru_cache(maxsize=None)
+def atlas_regions():
+    """Return {asset name: AtlasRegion} from the atlas manifest, or {} if there is none."""
+    manifest = _ASSETS_DIR / ATLAS_MANIFEST
+    if not manifest.exists():
+        return {}
+    with open(manifest, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        name: AtlasRegion(
+            image=asset_path(data["images"][region["image"]]),
+            x=region["x"],
+            y=region["y"],
+            width=region["width"],
+            height=region["height"],
+            scale=region["scale"],
+        )
+        for name, region in data["regions"].items()
+    }
+
+
+def atlas_region(path):
+    """Return the atlas region standing in for the asset file at path, or None."""
+    path = Path(path)
+    if path.parent != _ASSETS_DIR:
+        return None
+    return atlas_regions().get(path.name)
+
+
+@lru_cache(maxsize=None)
+def _background_manifest():
+    manifest = _ASSETS_DIR / BACKGROUND_MANIFEST
+    if not manifest.exists():
+        return {"backgrounds": {}, "variants": {}}
+    with open(manifest, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def background_path(name, width, height):
+    """Return the path of the background variant to draw at width x height pixels.
+
+    That is the smallest variant covering the area, or the largest one if
+    none does. A background without variants is loaded from its own file.
+    """
+    manifest = _background_manifest()
+    key = manifest["backgrounds"].get(name)
+    if key is None:
+        return asset_path(name)
+    variants = manifest["variants"][key]
+    covering = [v for v in variants if v["width"] >= width and v["height"] >= height]
+    if covering:
+        chosen = min(covering, key=lambda v: v["width"])
+    else:
+        chosen = max(variants, key=lambda v: v["width"])
+    return asset_path(chosen["file"])
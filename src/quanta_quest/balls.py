@@ -0,0 +1,221 @@
+"""Ball state store for Quanta Quest.
+
+Each ball of a level has a stable id, its index in the level file, and
+may have a role naming the part it plays in a puzzle. The engine finds
+puzzle balls through the store by role, so levels can place them
+anywhere and in any order.
+
+The store keeps the balls' data as arrays indexed by id: int8 states,
+master ids, goals and one boolean mask per role. QuantumBall sprites only
+hold their id and read and write through the store, so puzzle checks and
+bulk gate applications are single NumPy expressions over the level.
+
+Balls linked through masters are also simulated together, one
+gate_manipulator.LinkedStates per group, so gates on them and the
+entanglement checks follow their real joint state. states then holds the
+index each linked ball shows.
+"""
+
+import numpy as np
+
+from quanta_quest.gate_manipulator import LinkedStates, gate_on_state, gates_on_states
+
+# Roles a level can give its balls
+ENTANGLE_MASTER = "entangle_master"
+ENTANGLE_TARGET = "entangle_target"
+TELEPORT_SOURCE = "teleport_source"
+BELL_PARTNER = "bell_partner"
+TELEPORT_TARGET = "teleport_target"
+CHALLENGE = "challenge"
+
+ROLES = (
+    ENTANGLE_MASTER,
+    ENTANGLE_TARGET,
+    TELEPORT_SOURCE,
+    BELL_PARTNER,
+    TELEPORT_TARGET,
+    CHALLENGE,
+)
+
+# The state an H gate followed by a CNOT leaves both balls of a pair in
+ENTANGLED_STATE = 4
+
+
+class BallStore:
+    """The balls of a level as arrays, indexed by id and by role.
+
+    masters and goals hold -1 where a ball has none. sprites is filled in
+    by build_scene with the QuantumBall viewing each id.
+    """
+
+    def __init__(self, specs):
+        self.states = np.array([spec.state for spec in specs], dtype=np.int8)
+        self.masters = np.array(
+            [-1 if spec.master is None else spec.master for spec in specs], dtype=np.intp
+        )
+        self.goals = np.array(
+            [-1 if spec.goal is None else spec.goal for spec in specs], dtype=np.int8
+        )
+        self.roles = tuple(spec.role for spec in specs)
+        self.role_masks = {
+            role: np.array([r == role for r in self.roles], dtype=bool)
+            for role in set(self.roles) - {None}
+        }
+        self._role_ids = {role: np.flatnonzero(mask) for role, mask in self.role_masks.items()}
+        self.roots = self._roots()
+        self.links, self._link_ids, self._link_positions = self._links()
+        self.sprites = ()
+        # Set that collects each sprite whose state changes
+        self.dirty_set = None
+
+    def _roots(self):
+        # Follow masters by pointer jumping; levels have no master cycles
+        roots = np.arange(len(self.states))
+        while True:
+            parents = self.masters[roots]
+            linked = parents >= 0
+            if not linked.any():
+                return roots
+            roots = np.where(linked, parents, roots)
+
+    def _links(self):
+        # One LinkedStates per group of linked balls, and each ball's group
+        # (or -1) and position in it
+        links = []
+        link_ids = np.full(len(self.states), -1, dtype=np.intp)
+        link_positions = np.full(len(self.states), -1, dtype=np.intp)
+        for root in np.unique(self.roots[self.masters >= 0]):
+            members = self.group(root)
+            masters = self.masters[members]
+            positions = np.searchsorted(members, masters)
+            masters = [None if m < 0 else int(p) for m, p in zip(masters, positions)]
+            link_ids[members] = len(links)
+            link_positions[members] = np.arange(len(members))
+            links.append((members, LinkedStates(self.states[members], masters)))
+        return links, link_ids, link_positions
+
+    def _link(self, ball_id):
+        """Return ball_id's group members, their LinkedStates and its position."""
+        members, linked = self.links[self._link_ids[ball_id]]
+        return members, linked, int(self._link_positions[ball_id])
+
+    def __getitem__(self, ball_id):
+        return self.sprites[ball_id]
+
+    def __len__(self):
+        return len(self.states)
+
+    def __iter__(self):
+        return iter(self.sprites)
+
+    def with_role(self, role):
+        """Return the balls with role, in id order."""
+        return tuple(self.sprites[i] for i in self._role_ids.get(role, ()))
+
+    def role(self, role):
+        """Return the first ball with role, or None if there is none."""
+        ids = self._role_ids.get(role)
+        return self.sprites[ids[0]] if ids is not None and len(ids) else None
+
+    def set_state(self, ball_id, state):
+        """Set one ball's state.
+
+        Setting a linked ball's state restarts its group from the product
+        of its balls' states, ending any entanglement.
+        """
+        if self.states[ball_id] != state:
+            self.states[ball_id] = state
+            if self.dirty_set is not None:
+                self.dirty_set.add(self.sprites[ball_id])
+            if self._link_ids[ball_id] >= 0:
+                members, linked, _ = self._link(ball_id)
+                linked.prepare(self.states[members])
+
+    def set_states(self, ids, states):
+        """Set the states of the balls in ids at once; states may be a scalar.
+
+        Linked groups with a changed ball restart as in set_state.
+        """
+        changed = self._write(ids, states)
+        for link in np.unique(self._link_ids[changed]):
+            if link >= 0:
+                members, linked = self.links[link]
+                linked.prepare(self.states[members])
+
+    def _write(self, ids, states):
+        """Store states without touching the linked groups; return the ids that changed."""
+        ids = np.asarray(ids, dtype=np.intp)
+        changed = ids[self.states[ids] != states]
+        self.states[ids] = states
+        if self.dirty_set is not None and len(changed):
+            self.dirty_set.update(self.sprites[i] for i in changed)
+        return changed
+
+    def gate(self, ball_id, gate):
+        """Apply gate to one ball, with CNOT using its master; return the ids that changed.
+
+        A gate on a linked ball can change how the other balls of its group
+        show, for example when a CNOT kicks a phase back onto its master.
+        """
+        if self._link_ids[ball_id] < 0:
+            # An unlinked ball has no master, so CNOT leaves it alone
+            return self._write([ball_id], gate_on_state(int(self.states[ball_id]), gate))
+        members, linked, position = self._link(ball_id)
+        return self._write(members, linked.apply(gate, position))
+
+    def apply_gate(self, ids, gate):
+        """Apply gate to every ball in ids, with CNOT using each ball's master.
+
+        Unlinked balls are updated at once from the tables; linked balls go
+        through their groups one at a time.
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        linked = self._link_ids[ids] >= 0
+        free = ids[~linked]
+        self._write(free, gates_on_states(self.states[free], gate))
+        for ball_id in ids[linked]:
+            self.gate(ball_id, gate)
+
+    def group(self, ball_id):
+        """Return the ids of the balls linked to ball_id through masters."""
+        return np.flatnonzero(self.roots == self.roots[ball_id])
+
+    def solved_mask(self):
+        """Return which balls are at their goal; balls without a goal count as solved."""
+        return (self.goals < 0) | (self.states == self.goals)
+
+    def solved(self):
+        """Return whether every ball with a goal has reached it."""
+        return bool(self.solved_mask().all())
+
+    def entangled_mask(self):
+        """Return which balls form an entangled pair with their master."""
+        mask = np.zeros(len(self.states), dtype=bool)
+        for members, linked in self.links:
+            for position, master in enumerate(linked.masters):
+                if master is not None:
+                    mask[members[position]] = linked.is_entangled_pair(master, position)
+        return mask
+
+    def is_entangled_pair(self, master_id, target_id):
+        """Return whether target_id is entangled with its master master_id."""
+        if self.masters[target_id] != master_id:
+            return False
+        members, linked, position = self._link(target_id)
+        return linked.is_entangled_pair(linked.masters[position], position)
+
+    def snapshot(self):
+        """Return the states and the linked groups' joint states, for restore."""
+        return self.states.copy(), [linked.snapshot() for _, linked in self.links]
+
+    def restore(self, snapshot):
+        """Go back to the states saved by snapshot."""
+        states, links = snapshot
+        self._write(np.arange(len(self.states)), states)
+        for (_, linked), saved in zip(self.links, links):
+            linked.restore(saved)
+
+    def all_equal(self, role):
+        """Return whether the balls with role are all in the same state."""
+        states = self.states[self.role_masks[role]]
+        return bool(states.min() == states.max())
@@ -0,0 +1,104 @@
+"""Chunked, view-culled scene drawing for Quanta Quest.
+
+The camera shows about two screens' worth of a much wider map. A
+ChunkedScene copies the sprites of the static scene layers into x-chunks
+CHUNK_WIDTH pixels wide. Chunk edges fall halfway between the centres
+of neighbouring zones (see constants.new_zone_x), so each zone's content
+lands in one chunk. Each frame only the chunks overlapping the camera's
+view are drawn, so the draw cost follows what is on screen rather than
+the length of the level.
+
+A sprite belongs to the chunk holding its centre. The view is widened by
+the farthest any sprite reaches past its chunk's edges, so sprites that
+straddle an edge are never cut off. Invisible sprites, such as the
+merged ground walls, are left out. The chunk lists share their sprites
+with the scene, so removing a sprite from the scene, for example a
+collected gate, also removes it from its chunk.
+"""
+
+import math
+
+import arcade
+
+from quanta_quest.constants import GRID_PIXEL_SIZE, NEW_ZONE_SPACING, new_zone_x
+
+CHUNK_WIDTH = NEW_ZONE_SPACING * GRID_PIXEL_SIZE
+CHUNK_ORIGIN = new_zone_x(0) - CHUNK_WIDTH / 2
+
+# Scene layers in draw order, and which of them are drawn by chunk
+DRAW_ORDER = ("Player", "Ground", "Walls", "States", "Gates", "Items")
+CHUNKED_LAYERS = ("Ground", "Walls", "States", "Gates", "Items")
+
+
+def chunk_index(x):
+    """Return the index of the chunk holding x."""
+    return math.floor((x - CHUNK_ORIGIN) / CHUNK_WIDTH)
+
+
+class ChunkedScene:
+    """Draws a scene's layers chunk by chunk, skipping chunks out of view."""
+
+    def __init__(self, scene, draw_order=DRAW_ORDER, chunked=CHUNKED_LAYERS):
+        self.scene = scene
+        self.draw_order = draw_order
+        self.chunked = chunked
+        # {chunk index: {layer name: SpriteList}}
+        self.chunks = {}
+        self.margin = 0.0
+        # Sprites left out of the chunks, so the total drawn is known from
+        # the layer lengths alone
+        self.hidden = 0
+        for name in chunked:
+            for sprite in scene[name]:
+                if not sprite.visible:
+                    self.hidden += 1
+                    continue
+                index = chunk_index(sprite.center_x)
+                layers = self.chunks.setdefault(index, {})
+                if name not in layers:
+                    layers[name] = arcade.SpriteList()
+                layers[name].append(sprite)
+                left = CHUNK_ORIGIN + index * CHUNK_WIDTH
+                overhang = max(left - sprite.left, sprite.right - (left + CHUNK_WIDTH))
+                self.margin = max(self.margin, overhang)
+        self.first = self.last = None
+        self.drawn_chunks = self.culled_chunks = 0
+        self.drawn_sprites = self.culled_sprites = 0
+
+    def set_view(self, left, right):
+        """Set the x range of the map on screen."""
+        self.first = chunk_index(left - self.margin)
+        self.last = chunk_index(right + self.margin)
+
+    def set_view_from_camera(self, camera):
+        """Set the view to what camera shows, at its current position."""
+        x = camera.position[0]
+        self.set_view(x + camera.left, x + camera.right)
+
+    def in_view(self, sprite):
+        """Return whether sprite's chunk is drawn with the current view."""
+        return self.first is None or self.first <= chunk_index(sprite.center_x) <= self.last
+
+    def draw(self):
+        """Draw the layers in order, only the chunks in view for chunked ones."""
+        if self.first is None:
+            visible = list(self.chunks.values())
+        else:
+            visible = [
+                self.chunks[index] for index in range(self.first, self.last + 1)
+                if index in self.chunks
+            ]
+        for name in self.draw_order:
+            if name not in self.chunked:
+                self.scene[name].draw()
+                continue
+            for layers in visible:
+                sprite_list = layers.get(name)
+                if sprite_list:
+                    sprite_list.draw()
+
+        self.drawn_chunks = len(visible)
+        self.culled_chunks = len(self.chunks) - self.drawn_chunks
+        self.drawn_sprites = sum(len(sprite_list) for layers in visible for sprite_list in layers.values())
+        total = sum(len(self.scene[name]) for name in self.chunked) - self.hidden
+        self.culled_sprites = total - self.drawn_sprites
@@ -29,6 +29,13 @@ LEFT_FACING = 1
 PLAYER_START_X = SPRITE_PIXEL_SIZE * TILE_SCALING * 1
 PLAYER_START_Y = SPRITE_PIXEL_SIZE * TILE_SCALING * 1
 
+# Simulation rate and timing, in ticks per second and seconds
+TICK_RATE = 60
+TICK_SECONDS = 1 / TICK_RATE
+MAX_CATCH_UP_TICKS = 5
+BALL_CYCLE_SECONDS = 100 / 60
+END_DELAY_SECONDS = 200 / 60
+
 # Button layout
 BUTTON_POS_X = SCREEN_WIDTH // 2 - 150
 BUTTON_WIDTH = 300
@@ -52,6 +59,7 @@ TEXT_WIDTH = 400
 # Gate and state layout
 GATE_INTERVAL = 5
 GATE_NUMBER = 4
+GATES_PER_PICKUP = 2
 STATE_INTERVAL = 5
 STATE_NUMBER = 4
 BALL_SCALING = 0.8
@@ -0,0 +1,521 @@
+"""Headless game rules for Quanta Quest.
+
+GameEngine owns the level, the player physics and the puzzle logic, with
+no window, GUI or audio. Anything the player should see or hear is queued
+as an event: GameView turns events into message boxes and sounds, and
+run_script plays the same rules from a scripted list of inputs.
+"""
+
+import math
+import random
+from functools import partial
+
+import arcade
+import numpy as np
+
+from quanta_quest.balls import (
+    BELL_PARTNER,
+    CHALLENGE,
+    ENTANGLE_MASTER,
+    ENTANGLE_TARGET,
+    TELEPORT_SOURCE,
+    TELEPORT_TARGET,
+    BallStore,
+)
+from quanta_quest.constants import (
+    BALL_CYCLE_SECONDS,
+    END_DELAY_SECONDS,
+    GATES_PER_PICKUP,
+    GRAVITY,
+    GRID_PIXEL_SIZE,
+    PLAYER_JUMP_SPEED,
+    PLAYER_MOVEMENT_SPEED,
+    PLAYER_START_X,
+    PLAYER_START_Y,
+)
+from quanta_quest.gate_manipulator import gate_on_state
+from quanta_quest.levels import build_scene, load_level
+from quanta_quest.profiler import PROFILER
+from quanta_quest.scheduler import Timer
+from quanta_quest.solver import shortest_sequence
+from quanta_quest.sprites import PlayerCharacter
+from quanta_quest.triggers import TriggerMap
+
+# Event kinds, queued on GameEngine.events as (kind, value) pairs
+MESSAGE = "message"
+CHOICE = "choice"
+SOUND = "sound"
+GAME_OVER = "game_over"
+
+INTRO_MESSAGE = "Our explorer suddenly finds herself in the quantum world. In this world, information is stored in the colour and orientation of balls."
+
+# Shown when the player picks up a gate, by gate name
+GATE_MESSAGES = {
+    "X": "You have collected two X gates. You will learn how to use it very soon. You will need these gates later, so keep them handy.",
+    "Z": "You have collected two Z gates. You will learn how to use it very soon.",
+    "H": "You have collected two Hadamard gates. You will learn how to use it very soon.",
+    "C": "You have collected two CNOT gates, which, unlike the other gates, only act on pairs of balls. You will learn how to use it very soon.",
+}
+
+TELEPORT_QUESTION = "Note that the upper ball has now become non-entangled. Complete the teleportation by figuring out the correct gate (X/Z/H) that will convert the upper ball into the black ball we wanted to teleport. Answer by clicking one of the buttons."
+TELEPORT_CHOICES = ["X gate", "Z gate", "H gate"]
+
+# Movement keys and the flag each one holds while pressed
+MOVEMENT_KEYS = {
+    arcade.key.UP: "up_pressed",
+    arcade.key.W: "up_pressed",
+    arcade.key.DOWN: "down_pressed",
+    arcade.key.S: "down_pressed",
+    arcade.key.LEFT: "left_pressed",
+    arcade.key.A: "left_pressed",
+    arcade.key.RIGHT: "right_pressed",
+    arcade.key.D: "right_pressed",
+}
+
+# Plain attributes saved by GameEngine.snapshot
+_SNAPSHOT_FLAGS = (
+    "game_over",
+    "can_move",
+    "left_pressed",
+    "right_pressed",
+    "up_pressed",
+    "down_pressed",
+    "jump_needs_reset",
+    "shoot_pressed",
+)
+
+
+class GameEngine:
+    """Game state and rules for one playthrough, independent of rendering."""
+
+    def __init__(self, level="main", seed=None):
+        self.level = load_level(level)
+        # Every random choice in the game comes from this generator, so a
+        # playthrough can be repeated by passing the same seed.
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = np.random.default_rng(self.seed)
+        self.events = []
+        self.game_over = False
+        # Ticks simulated so far, the clock input logs are kept against
+        self.ticks = 0
+        # Optional replay.InputRecorder told about every input
+        self.recorder = None
+
+        self.show_instruction = [True] * (len(self.level.messages) + 1)
+        self.show_instruction_challenges = [True] * 4
+
+        self.left_pressed = False
+        self.right_pressed = False
+        self.up_pressed = False
+        self.down_pressed = False
+        self.jump_needs_reset = False
+        self.shoot_pressed = False
+        self.can_move = True
+
+        self.collected_gates = {"X": 0, "Z": 0, "H": 0, "C": 0}
+
+        # Set up the player, specifically placing it at these coordinates.
+        self.player_sprite = PlayerCharacter()
+        self.player_sprite.center_x = PLAYER_START_X
+        self.player_sprite.center_y = PLAYER_START_Y
+
+        self.balls = BallStore(self.level.balls)
+        self.scene = build_scene(self.level, self.player_sprite, self.balls)
+        self.init_ball = self.scene["States"][self.level.init_ball]
+        # Delay between a wrong teleport answer and the end of the game
+        self.end_timer = Timer(END_DELAY_SECONDS)
+
+        self.physics_engine = arcade.PhysicsEnginePlatformer(
+            self.player_sprite, gravity_constant=GRAVITY, walls=self.scene["Walls"]
+        )
+        self.end_of_map = self.level.width * GRID_PIXEL_SIZE
+        # The first ball shows every state in turn
+        self.ball_timer = Timer(BALL_CYCLE_SECONDS, repeat=True)
+        self.ball_timer.start()
+
+        self._register_triggers()
+        self.key_actions = self._key_actions()
+
+    def _register_triggers(self):
+        """Register the one-off instructions and checks of the level."""
+        self.triggers = TriggerMap()
+        states = self.scene["States"]
+
+        intro = self.triggers.add_zone(math.nextafter(PLAYER_START_X, math.inf))
+        intro.on_enter.append(self._show_intro)
+
+        margin = self.player_sprite.width
+        for ball in states:
+            if ball.message_index is not None:
+                zone = self.triggers.add_zone(ball.left - margin, ball.right + margin)
+                zone.while_inside.append(lambda ball=ball: self._touch_ball(ball))
+
+        source = self.balls.role(TELEPORT_SOURCE)
+        if source is not None:
+            self.triggers.watch(source, self._bell_instruction)
+
+        master = self.balls.role(ENTANGLE_MASTER)
+        target = self.balls.role(ENTANGLE_TARGET)
+        if master is not None and target is not None:
+            entanglement = self.triggers.add_zone(target.center_x + target.width)
+            entanglement.on_enter.append(self._judge_entanglement)
+            for ball in (master, target):
+                self.triggers.watch(
+                    ball,
+                    lambda ball: self.triggers.inside(entanglement) and self._judge_entanglement(),
+                )
+
+        end = self.triggers.add_zone(self.end_of_map)
+        end.on_enter.append(self._reach_end)
+
+    def _show_intro(self):
+        self.show_message(INTRO_MESSAGE)
+
+        self.left_pressed, self.right_pressed, self.up_pressed, self.down_pressed, self.jump_needs_reset, self.shoot_pressed = [False] * 6
+        self.show_instruction[0] = False
+        return True
+
+    def _touch_ball(self, ball):
+        """Show a ball's message the first time the player touches it."""
+        if not arcade.check_for_collision(self.player_sprite, ball):
+            return False
+        if self.show_instruction[ball.message_index + 1]:
+            self.show_message(self.level.messages[ball.message_index])
+            self.show_instruction[ball.message_index + 1] = False
+        return True
+
+    def _bell_instruction(self, ball):
+        if ball.state != 2:
+            return False
+        self.show_message("Great. The next step is to perform a \"Bell measurement\" on the pair of lower balls, by pressing ALT+M on the lowest ball. This will transfer the entanglement to the lower balls.")
+        self.show_instruction_challenges[1] = False
+        return True
+
+    def _judge_entanglement(self):
+        """Comment on the entangled pair once the player has walked past it.
+
+        Each remark is made at most once; the trigger is done once the
+        pair has been entangled correctly.
+        """
+        while self._entanglement_remark():
+            pass
+        return not self.show_instruction_challenges[0]
+
+    def _entanglement_remark(self):
+        master = self.balls.role(ENTANGLE_MASTER).ball_id
+        target = self.balls.role(ENTANGLE_TARGET).ball_id
+        states = self.balls.states
+        if self.balls.is_entangled_pair(master, target) and self.show_instruction_challenges[0]:
+            self.show_message("Well done! You can see the entanglement in the fact that the colours of the two halves are correlated: white is above white and black is above black. Have another hadamard!")
+            self.collected_gates['H'] += 1
+            self.show_instruction_challenges[0] = False
+            self.show_instruction_challenges[3] = False
+            self.show_instruction_challenges[2] = False
+        elif states[master] == 2 and states[target] == 0 and self.show_instruction_challenges[2]:
+            self.show_message("It seems like you skipped it. It would be useful if you learnt this before proceeding.")
+            self.show_instruction_challenges[2] = False
+        elif self.show_instruction_challenges[3]:
+            self.show_message("I don't think you applied the correct operations. Want to try again before proceeding?")
+            self.show_instruction_challenges[3] = False
+        else:
+            return False
+        return True
+
+    def _reach_end(self):
+        self.end_game()
+        return True
+
+    def set_state(self, ball, state):
+        """Change a ball's state and run the triggers watching it."""
+        ball.state = state
+        self.triggers.state_changed(ball)
+
+    def set_states(self, balls, state):
+        """Change several balls to the same state at once, then run their triggers."""
+        self.balls.set_states([ball.ball_id for ball in balls], state)
+        for ball in balls:
+            self.triggers.state_changed(ball)
+
+    def hint(self, ball):
+        """Return the shortest (gate, ball) steps to the goal of ball's puzzle.
+
+        The puzzle is ball together with the balls it is linked to through
+        masters. Returns None if the puzzle has no goal or the collected
+        gates cannot reach it, and () if it is already solved.
+        """
+        balls = self.balls
+        members = balls.group(ball.ball_id)
+        goals = balls.goals[members]
+        if (goals < 0).all():
+            return None
+        masters = balls.masters[members]
+        # Members are in id order, so a master's position is found by bisection
+        positions = np.searchsorted(members, masters)
+        masters = tuple(None if m < 0 else int(p) for m, p in zip(masters, positions))
+        goal = tuple(None if g < 0 else int(g) for g in goals)
+        steps = shortest_sequence(
+            tuple(balls.states[members].tolist()), goal, self.collected_gates, masters
+        )
+        if steps is None:
+            return None
+        return tuple((gate, balls[members[i]]) for gate, i in steps)
+
+    def pop_events(self):
+        """Return and clear the events queued since the last call."""
+        events = self.events
+        self.events = []
+        return events
+
+    def _record(self, action, key=0, modifiers=0):
+        if self.recorder is not None:
+            self.recorder.log(self.ticks, action, key, modifiers)
+
+    def snapshot(self):
+        """Return the state that changes during play, for restore on this engine.
+
+        A snapshot shares the level's sprites with the engine, so it can
+        only be restored on the engine that took it.
+        """
+        player = self.player_sprite
+        return {
+            "ticks": self.ticks,
+            "player": (
+                player.position,
+                player.change_x,
+                player.change_y,
+                getattr(player, "can_jump", None),
+                player.character_face_direction,
+                player.cur_texture,
+                player.texture,
+            ),
+            "jumps_since_ground": self.physics_engine.jumps_since_ground,
+            "balls": self.balls.snapshot(),
+            "gates": list(self.scene["Gates"]),
+            "collected_gates": dict(self.collected_gates),
+            "flags": {name: getattr(self, name) for name in _SNAPSHOT_FLAGS},
+            "show_instruction": list(self.show_instruction),
+            "show_instruction_challenges": list(self.show_instruction_challenges),
+            "timers": [(timer.elapsed, timer.running) for timer in (self.ball_timer, self.end_timer)],
+            "rng": self.rng.bit_generator.state,
+            "triggers": self.triggers.snapshot(),
+            "events": list(self.events),
+        }
+
+    def restore(self, snapshot):
+        """Put the engine back in the state saved by snapshot()."""
+        self.ticks = snapshot["ticks"]
+        player = self.player_sprite
+        (
+            player.position,
+            player.change_x,
+            player.change_y,
+            player.can_jump,
+            player.character_face_direction,
+            player.cur_texture,
+            player.texture,
+        ) = snapshot["player"]
+        self.physics_engine.jumps_since_ground = snapshot["jumps_since_ground"]
+        self.balls.restore(snapshot["balls"])
+        gates = self.scene["Gates"]
+        for gate in list(gates):
+            gate.remove_from_sprite_lists()
+        gates.extend(snapshot["gates"])
+        self.collected_gates = dict(snapshot["collected_gates"])
+        for name, value in snapshot["flags"].items():
+            setattr(self, name, value)
+        self.show_instruction = list(snapshot["show_instruction"])
+        self.show_instruction_challenges = list(snapshot["show_instruction_challenges"])
+        for timer, (elapsed, running) in zip((self.ball_timer, self.end_timer), snapshot["timers"]):
+            timer.elapsed = elapsed
+            timer.running = running
+        self.rng.bit_generator.state = snapshot["rng"]
+        self.triggers.restore(snapshot["triggers"])
+        self.events = list(snapshot["events"])
+
+    def show_message(self, message):
+        """Queue a message box; the player cannot move until it is dismissed."""
+        self.can_move = False
+        self.events.append((MESSAGE, message))
+
+    def dismiss_message(self):
+        """Close the open message box and let the player move again."""
+        if not self.can_move:
+            self._record("dismiss_message")
+        self.can_move = True
+
+    def end_game(self):
+        if not self.game_over:
+            self.game_over = True
+            self.events.append((GAME_OVER, None))
+
+    def process_keychange(self):
+        """
+        Called when we change a key up/down or we move on/off a ladder.
+        """
+        # Process up/down
+        if self.up_pressed and not self.down_pressed:
+            if (
+                self.physics_engine.can_jump(y_distance=10)
+                and not self.jump_needs_reset
+            ):
+                self.player_sprite.change_y = PLAYER_JUMP_SPEED
+                self.jump_needs_reset = True
+                self.events.append((SOUND, "jump"))
+
+        # Process left/right
+        if self.right_pressed and not self.left_pressed:
+            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
+        elif self.left_pressed and not self.right_pressed:
+            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
+        else:
+            self.player_sprite.change_x = 0
+
+    def key_press(self, key, modifiers=0):
+        """Handle a movement key being pressed."""
+        self._record("key_press", key, modifiers)
+        flag = MOVEMENT_KEYS.get(key)
+        if flag is not None:
+            setattr(self, flag, True)
+
+        self.process_keychange()
+
+    def key_release(self, key, modifiers=0):
+        """Handle a key release: movement, gate application and puzzle checks."""
+        self._record("key_release", key, modifiers)
+        flag = MOVEMENT_KEYS.get(key)
+        if flag is not None:
+            setattr(self, flag, False)
+            if flag == "up_pressed":
+                self.jump_needs_reset = False
+
+        actions = self.key_actions.get((key, modifiers & arcade.key.MOD_ALT))
+        if actions:
+            for hit_state in arcade.check_for_collision_with_list(self.player_sprite, self.scene["States"]):
+                for action in actions:
+                    action(hit_state)
+
+        self.process_keychange()
+
+    def _key_actions(self):
+        """Return {(key, MOD_ALT or 0): actions run on each ball the player touches}."""
+        actions = {}
+        for gate in self.collected_gates:
+            key = getattr(arcade.key, gate)
+            actions[(key, arcade.key.MOD_ALT)] = (partial(self._apply_gate, gate), self._check_challenge)
+            actions[(key, 0)] = (self._check_challenge,)
+        actions[(arcade.key.M, arcade.key.MOD_ALT)] = (self._bell_measurement,)
+        return actions
+
+    def _apply_gate(self, gate, ball):
+        """Use up a collected gate on ball."""
+        if self.collected_gates[gate] <= 0:
+            return
+        if gate == "C" and ball.master is None:
+            return
+        changed = self.balls.gate(ball.ball_id, gate)
+        self.triggers.state_changed(ball)
+        # A CNOT can also change how the master shows
+        for ball_id in changed:
+            if ball_id != ball.ball_id:
+                self.triggers.state_changed(self.balls[ball_id])
+        self.collected_gates[gate] -= 1
+        self.events.append((SOUND, "shoot"))
+
+    def _bell_measurement(self, ball):
+        """Measure the teleport source with its partner, once the pair is ready."""
+        if ball.role != TELEPORT_SOURCE or self.show_instruction_challenges[1] is not False:
+            return
+        self.set_states((ball, self.balls.role(BELL_PARTNER)), 4)
+        self.set_state(self.balls.role(TELEPORT_TARGET), 2 * int(self.rng.integers(2)))
+        self.events.append((CHOICE, (TELEPORT_QUESTION, TELEPORT_CHOICES)))
+
+    def _check_challenge(self, ball):
+        """Judge the final challenge after a gate key on one of its balls."""
+        if ball.role != CHALLENGE:
+            return
+        if self.balls.all_equal(CHALLENGE):
+            self.show_message("Great! You have finished the game.")
+        else:
+            self.show_message("Oops! That did't work. Try again?")
+
+    def answer_teleport(self, button_text):
+        """Apply the gate picked in the teleportation question, e.g. "X gate"."""
+        self._record("answer_teleport", TELEPORT_CHOICES.index(button_text))
+        ball = self.balls.role(TELEPORT_TARGET)
+        self.set_state(ball, gate_on_state(ball.state, button_text[0]))
+        if ball.state in [2, 3]:
+            self.show_message("Nicely done! You have successfully teleported the ball. Proceed to complete the game.")
+        else:
+            self.show_message("Sadly, that wasn't the correct answer. You will have to start from the beginning.")
+            self.end_timer.start()
+
+    def update(self):
+        """Advance the game by one tick of TICK_SECONDS."""
+        if self.game_over:
+            return
+        self.ticks += 1
+
+        if self.ball_timer.tick():
+            self.set_state(self.init_ball, (self.init_ball.state + 1) % 8)
+
+        # Move the player with the physics engine
+        if self.can_move:
+            with PROFILER.section("physics"):
+                self.physics_engine.update()
+
+        with PROFILER.section("triggers"):
+            self.triggers.update(self.player_sprite.center_x)
+
+        if self.physics_engine.can_jump():
+            self.player_sprite.can_jump = False
+        else:
+            self.player_sprite.can_jump = True
+
+        self.process_keychange()
+
+        if self.end_timer.tick():
+            self.end_game()
+
+        if self.player_sprite.center_y < -100:
+            self.player_sprite.center_x = PLAYER_START_X
+            self.player_sprite.center_y = PLAYER_START_Y
+
+            self.events.append((SOUND, "game_over"))
+
+        with PROFILER.section("collisions"):
+            gate_hit_list = arcade.check_for_collision_with_list(
+                self.player_sprite, self.scene["Gates"]
+            )
+
+        for gate in gate_hit_list:
+            self.show_message(GATE_MESSAGES[gate.name])
+            self.collected_gates[gate.name] += GATES_PER_PICKUP
+            self.events.append((SOUND, "coin"))
+            gate.remove_from_sprite_lists()
+
+
+def run_script(script, frames, engine=None, dismiss_messages=True):
+    """Play the game headlessly for a number of ticks, feeding scripted input.
+
+    script is an iterable of (frame, action, *args) tuples in frame order,
+    where a frame is one tick of the engine and action names a GameEngine
+    input method such as "key_press", "key_release", "dismiss_message" or
+    "answer_teleport". Scripted inputs run before the update of their
+    frame. With dismiss_messages, message boxes are closed as soon as they
+    open, as if the player pressed Enter straight away. Stops early on game
+    over and returns the engine.
+    """
+    if engine is None:
+        engine = GameEngine()
+    script = iter(script)
+    pending = next(script, None)
+    for frame in range(frames):
+        while pending is not None and pending[0] <= frame:
+            getattr(engine, pending[1])(*pending[2:])
+            pending = next(script, None)
+        if dismiss_messages:
+            engine.dismiss_message()
+        engine.update()
+        if engine.game_over:
+            break
+    return engine
@@ -1,69 +1,79 @@
 """Quantum gate simulation for Quanta Quest."""
 
-import random
-
 import numpy as np
-from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector
 
 
-def state0():
+def _statevector(*ops):
+    """Run the named single-qubit gates on |0⟩ with qiskit and return the result.
+
+    qiskit is imported here instead of at module level so that starting the
+    game does not pay for it; it only serves as a reference backend, and
+    is installed with the "verify" extra.
+    """
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit.quantum_info import Statevector
+    except ImportError as exc:
+        raise ImportError(
+            "the verify_* checks need qiskit; install it with "
+            "pip install 'quanta-quest[verify]' or uv sync --extra verify"
+        ) from exc
+
     qc = QuantumCircuit(1)
+    for op in ops:
+        getattr(qc, op)(0)
     statevector = Statevector.from_instruction(qc)
     return np.array(statevector.data)
 
+
+def state0():
+    return _statevector()
+
 def state1():
-    qc = QuantumCircuit(1)
-    qc.x(0); qc.z(0); qc.x(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("x", "z", "x")
 
 def state2():
-    qc = QuantumCircuit(1)
-    qc.x(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("x")
 
 def state3():
-    qc = QuantumCircuit(1)
-    qc.x(0); qc.z(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("x", "z")
 
 def state4():
-    qc = QuantumCircuit(1)
-    qc.h(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("h")
 
 def state5():
-    qc = QuantumCircuit(1)
-    qc.x(0); qc.h(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("x", "h")
 
 def state6():
-    qc = QuantumCircuit(1)
-    qc.x(0); qc.h(0); qc.x(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("x", "h", "x")
 
 def state7():
-    qc = QuantumCircuit(1)
-    qc.h(0); qc.z(0); qc.x(0); qc.z(0)
-    statevector = Statevector.from_instruction(qc)
-    return np.array(statevector.data)
+    return _statevector("h", "z", "x", "z")
+
 
+# The eight basis states as produced by state0() ... state7()
+_R = 1 / np.sqrt(2)
+_BASIS_STATES = np.array([
+    [1, 0],
+    [-1, 0],
+    [0, 1],
+    [0, -1],
+    [_R, _R],
+    [_R, -_R],
+    [-_R, _R],
+    [-_R, -_R],
+], dtype=complex)
 
-# Precompute all states once
-_STATES = None
 
 def _get_states():
-    global _STATES
-    if _STATES is None:
-        _STATES = [state0(), state1(), state2(), state3(),
-                    state4(), state5(), state6(), state7()]
-    return _STATES
+    return _BASIS_STATES
+
+
+def verify_basis_states():
+    """Compare the built-in basis table with qiskit, returning mismatching indices."""
+    builders = [state0, state1, state2, state3, state4, state5, state6, state7]
+    return [i for i, build in enumerate(builders)
+            if not np.allclose(build(), _BASIS_STATES[i])]
 
 
 # Gate matrices
@@ -73,8 +83,74 @@ _Hgate = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
 _Sgate = np.array([[1, 0], [0, 1j]])
 
 
+# Transition tables: result index for every (state index, gate, master state).
+# Checked against the matrix path by verify_transition_table().
+_GATE_TABLE = {
+    "X": (2, 3, 0, 1, 4, 6, 5, 7),
+    "Z": (0, 1, 3, 2, 5, 4, 7, 6),
+    "H": (4, 7, 5, 6, 0, 2, 3, 1),
+    "S": (0, 1, 2, 3, 4, 5, 6, 7),
+}
+
+_CNOT_IDLE = (0, 1, 2, 3, 4, 5, 6, 7)
+_CNOT_FLIP = _GATE_TABLE["X"]
+_CNOT_SPREAD = (4, 7, 4, 7, 4, 5, 6, 7)
+
+# Indexed by master state: |0⟩ leaves the target alone, |1⟩ flips it and a
+# superposed master spreads the target into superposition.
+_CNOT_TABLE = (
+    _CNOT_IDLE, _CNOT_IDLE, _CNOT_FLIP, _CNOT_FLIP,
+    _CNOT_SPREAD, _CNOT_SPREAD, _CNOT_SPREAD, _CNOT_SPREAD,
+)
+
+# The same tables as arrays, for the batch API
+_GATE_ARRAYS = {gate: np.array(row, dtype=np.int8) for gate, row in _GATE_TABLE.items()}
+_CNOT_ARRAY = np.array(_CNOT_TABLE, dtype=np.int8)
+
+# Measurement: collapsed index for definite states, P(|0⟩) for the rest
+_COLLAPSED = (0, 0, 2, 2, None, None, None, None)
+_PROB_ZERO = (1.0, 1.0, 0.0, 0.0, 0.5, 0.5, 0.5, 0.5)
+_PROB_ZERO_ARRAY = np.array(_PROB_ZERO)
+
+# Used when a measurement is not given a generator
+_DEFAULT_RNG = np.random.default_rng()
+
+
 def gate_on_state(state_number, gate, master_number=None):
     """Apply a quantum gate to a state and return the resulting state index."""
+    if gate == "C":
+        if master_number is None:
+            return state_number
+        return _CNOT_TABLE[master_number][state_number]
+    row = _GATE_TABLE.get(gate)
+    if row is None:
+        return state_number
+    return row[state_number]
+
+
+def gates_on_states(state_numbers, gate, master_numbers=None):
+    """Apply a gate to many states at once and return the new state indices.
+
+    state_numbers is an array of state indices. For CNOT, master_numbers
+    gives the master state for each entry; a negative value means no
+    master, which leaves that entry unchanged, as does a missing array.
+    Returns an int8 array shaped like state_numbers.
+    """
+    state_numbers = np.asarray(state_numbers)
+    if gate == "C":
+        if master_numbers is None:
+            return state_numbers.astype(np.int8)
+        master_numbers = np.asarray(master_numbers)
+        result = _CNOT_ARRAY[master_numbers, state_numbers]
+        return np.where(master_numbers < 0, state_numbers, result).astype(np.int8)
+    table = _GATE_ARRAYS.get(gate)
+    if table is None:
+        return state_numbers.astype(np.int8)
+    return table[state_numbers]
+
+
+def _matrix_gate_on_state(state_number, gate, master_number=None):
+    """Reference implementation of gate_on_state using the gate matrices."""
     states_arr = _get_states()
     state = states_arr[state_number]
     if gate == "C":
@@ -110,27 +186,72 @@ def _apply_cnot(state, state_number, master_number, states_arr):
     return state_number
 
 
-def measure_state(state_number):
+def verify_transition_table():
+    """Check the transition tables against the matrix path.
+
+    Returns a list of mismatching (state, gate, master, table, matrix)
+    tuples, which is empty when the tables are correct.
+    """
+    states_arr = _get_states()
+    mismatches = []
+    for state_number in range(len(states_arr)):
+        for gate in _GATE_TABLE:
+            expected = _matrix_gate_on_state(state_number, gate)
+            actual = gate_on_state(state_number, gate)
+            if actual != expected:
+                mismatches.append((state_number, gate, None, actual, expected))
+        for master_number in [None] + list(range(len(states_arr))):
+            expected = _matrix_gate_on_state(state_number, "C", master_number)
+            actual = gate_on_state(state_number, "C", master_number)
+            if actual != expected:
+                mismatches.append((state_number, "C", master_number, actual, expected))
+        prob_zero = abs(states_arr[state_number][0]) ** 2
+        if not np.isclose(prob_zero, _PROB_ZERO[state_number]):
+            mismatches.append((state_number, "M", None, _PROB_ZERO[state_number], prob_zero))
+    return mismatches
+
+
+def measure_state(state_number, rng=None):
     """Measure a quantum state, collapsing superposition to a basis state.
 
     Returns the collapsed state index:
     - States 0, 1 (|0⟩ variants) → remain as-is (already definite)
     - States 2, 3 (|1⟩ variants) → remain as-is (already definite)
     - States 4-7 (superpositions) → collapse to 0 or 2 with appropriate probability
+
+    rng is a numpy.random.Generator; pass a seeded one for repeatable runs.
     """
-    if state_number in [0, 1]:
-        return 0  # Already |0⟩
-    elif state_number in [2, 3]:
-        return 2  # Already |1⟩
+    collapsed = _COLLAPSED[state_number]
+    if collapsed is not None:
+        return collapsed
+    if rng is None:
+        rng = _DEFAULT_RNG
+    if rng.random() < _PROB_ZERO[state_number]:
+        return 0  # Collapsed to |0⟩
     else:
-        # Superposition state: compute probability of |0⟩
-        states_arr = _get_states()
-        state = states_arr[state_number]
-        prob_zero = abs(state[0]) ** 2
-        if random.random() < prob_zero:
-            return 0  # Collapsed to |0⟩
-        else:
-            return 2  # Collapsed to |1⟩
+        return 2  # Collapsed to |1⟩
+
+
+def measure_states(state_numbers, rng=None):
+    """Measure an array of states once each, returning an int8 array of 0s and 2s."""
+    if rng is None:
+        rng = _DEFAULT_RNG
+    prob_zero = _PROB_ZERO_ARRAY[np.asarray(state_numbers)]
+    return np.where(rng.random(prob_zero.shape) < prob_zero, 0, 2).astype(np.int8)
+
+
+def sample_measurements(state_numbers, shots, rng=None):
+    """Count the outcomes of measuring each state shots times.
+
+    state_numbers may be a single index or an array. Returns the counts with
+    an extra last axis of length 2: how often |0⟩ and |1⟩ came up. All
+    shots are drawn together as one binomial sample per state.
+    """
+    if rng is None:
+        rng = _DEFAULT_RNG
+    prob_zero = _PROB_ZERO_ARRAY[np.asarray(state_numbers)]
+    zeros = rng.binomial(shots, prob_zero)
+    return np.stack([zeros, shots - zeros], axis=-1)
 
 
 def is_superposition(state_number):
@@ -139,5 +260,109 @@ def is_superposition(state_number):
 
 
 def is_entangled_pair(state1_number, state2_number):
-    """Check if two states form an entangled-like pair (both in superposition)."""
+    """Check if two unlinked states form an entangled-like pair (both in superposition).
+
+    State indices alone cannot tell entanglement apart; balls linked
+    through masters are checked exactly with LinkedStates.is_entangled_pair.
+    """
     return is_superposition(state1_number) and is_superposition(state2_number)
+
+
+class LinkedStates:
+    """Exact joint state of a group of balls linked through masters.
+
+    The single-ball tables above can only fake a CNOT whose master is in
+    superposition, by putting the target into superposition too. Linked
+    balls are instead simulated together in a statevector.QubitRegister,
+    so a CNOT really entangles them and can kick a phase back onto its
+    master. state_numbers holds the index each ball shows: its exact
+    state while it is unentangled, and the single-ball result of the last
+    gate applied to it while it is entangled.
+
+    While every ball is unentangled the tables are exact, so the register
+    is only built for a CNOT on a superposed master, and dropped again once
+    the balls are all unentangled.
+
+    masters gives, for each ball, the position of its master in the group,
+    or None.
+    """
+
+    def __init__(self, state_numbers, masters, rng=None):
+        self.masters = tuple(masters)
+        self.rng = rng
+        self.prepare(state_numbers)
+
+    def prepare(self, state_numbers):
+        """Reset the group to the product of the given one-ball states."""
+        self.state_numbers = [int(state_number) for state_number in state_numbers]
+        self.register = None
+
+    def _build_register(self):
+        # statevector builds on this module's tables, so it is imported here
+        from quanta_quest.statevector import QubitRegister
+
+        self.register = QubitRegister.from_states(self.state_numbers, self.rng)
+        return self.register
+
+    def apply(self, gate, ball):
+        """Apply gate to the ball at position ball, a CNOT using its master.
+
+        Returns the new state_numbers.
+        """
+        states = self.state_numbers
+        master = self.masters[ball]
+        if gate == "C":
+            if master is None:
+                return states
+            shown = gate_on_state(states[ball], gate, states[master])
+        elif gate in _GATE_TABLE:
+            shown = gate_on_state(states[ball], gate)
+        else:
+            return states
+        register = self.register
+        if register is None and (gate != "C" or not is_superposition(states[master])):
+            states[ball] = shown
+            return states
+
+        if register is None:
+            register = self._build_register()
+        if gate == "C":
+            register.cnot(master, ball)
+        else:
+            register.apply_gate(gate, ball)
+        states[ball] = shown
+        for position in range(len(states)):
+            state_number = register.qubit_state(position)
+            if state_number is not None:
+                states[position] = state_number
+        if None not in register.known:
+            self.register = None
+        return states
+
+    def is_entangled_pair(self, first, second):
+        """Return whether the balls at first and second are entangled with each other.
+
+        They are when each is entangled with the rest of the group but the
+        two together are not.
+        """
+        register = self.register
+        return register is not None and (
+            register.is_entangled(first)
+            and register.is_entangled(second)
+            and not register.is_entangled((first, second))
+        )
+
+    def snapshot(self):
+        register = self.register
+        if register is None:
+            return None, None, list(self.state_numbers)
+        return register.state.copy(), list(register.known), list(self.state_numbers)
+
+    def restore(self, snapshot):
+        state, known, state_numbers = snapshot
+        self.state_numbers = list(state_numbers)
+        self.register = None
+        if state is not None:
+            register = self._build_register()
+            register.state[...] = state
+            register.known = list(known)
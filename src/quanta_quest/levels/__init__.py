@@ -0,0 +1,230 @@
+"""Level files and loader for Quanta Quest.
+
+A level is a JSON file in this directory. Positions are in pixels, except
+for "width", which is in grid units. It holds:
+
+- "width": map width; the ground runs across it and the exit sign ends it
+- "gaps": optional grid columns left without a ground tile
+- "textures": the "ground", "platform" and "exit" tile textures
+- "ground_y", "exit_y": heights of the ground row and the exit sign
+- "init_ball": index of the ball that cycles through all states
+- "platforms": floating platform tiles, as {"x", "y"}
+- "balls": {"state", "x", "y"} plus optional "scale" (relative to
+  BALL_SCALING), "master" (index of another ball), "message", "goal"
+  (the state the player has to bring the ball to) and "role" (one of
+  balls.ROLES). A ball's index is its stable id.
+- "gates": {"name", "x", "y"} for collectable gates
+- "messages": texts shown when the player first touches a ball
+"""
+
+import itertools
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import arcade
+
+from quanta_quest.balls import ROLES, BallStore
+from quanta_quest.chunks import chunk_index
+from quanta_quest.constants import GRID_PIXEL_SIZE, TILE_SCALING
+from quanta_quest.solver import GATE_NAMES, STATE_COUNT, check_level
+from quanta_quest.sprites import GAME_TEXTURES, TEXTURES, QuantumBall, QuantumGate
+
+_LEVELS_DIR = Path(__file__).parent
+
+class BallSpec(NamedTuple):
+    state: int
+    x: float
+    y: float
+    scale: float = 1.0
+    master: int | None = None
+    message: int | None = None
+    goal: int | None = None
+    role: str | None = None
+
+
+class GateSpec(NamedTuple):
+    name: str
+    x: float
+    y: float
+
+
+class Level(NamedTuple):
+    name: str
+    width: float
+    textures: dict
+    ground_y: float
+    exit_y: float
+    init_ball: int
+    platforms: tuple
+    balls: tuple
+    gates: tuple
+    messages: tuple
+    gaps: frozenset = frozenset()
+
+
+def level_path(name: str) -> str:
+    """Return the absolute path to a level file."""
+    return str(_LEVELS_DIR / f"{name}.json")
+
+
+@lru_cache(maxsize=None)
+def load_level(name="main"):
+    """Parse and validate a level file, caching the result by name.
+
+    A level whose puzzles cannot be solved with the gates placed before
+    them is rejected too.
+    """
+    with open(level_path(name), encoding="utf-8") as f:
+        data = json.load(f)
+    level = Level(
+        name=name,
+        width=data["width"],
+        textures=dict(data["textures"]),
+        ground_y=data["ground_y"],
+        exit_y=data["exit_y"],
+        init_ball=data["init_ball"],
+        platforms=tuple((p["x"], p["y"]) for p in data["platforms"]),
+        balls=tuple(BallSpec(**b) for b in data["balls"]),
+        gates=tuple(GateSpec(**g) for g in data["gates"]),
+        messages=tuple(data["messages"]),
+        gaps=frozenset(data.get("gaps", ())),
+    )
+    _validate(level)
+    problems = check_level(level)
+    if problems:
+        raise ValueError("; ".join(problems))
+    return level
+
+
+def _validate(level):
+    """Raise ValueError if the level refers to anything that does not exist."""
+    for key in ("ground", "platform", "exit"):
+        if key not in level.textures:
+            raise ValueError(f"{level.name}: missing {key!r} texture")
+    if not 0 <= level.init_ball < len(level.balls):
+        raise ValueError(f"{level.name}: init_ball {level.init_ball} out of range")
+    for i, ball in enumerate(level.balls):
+        if not 0 <= ball.state < STATE_COUNT:
+            raise ValueError(f"{level.name}: ball {i} has invalid state {ball.state}")
+        if ball.master is not None and not (
+            0 <= ball.master < len(level.balls) and ball.master != i
+        ):
+            raise ValueError(f"{level.name}: ball {i} has invalid master {ball.master}")
+        if ball.message is not None and not 0 <= ball.message < len(level.messages):
+            raise ValueError(f"{level.name}: ball {i} has invalid message {ball.message}")
+        if ball.goal is not None and not 0 <= ball.goal < STATE_COUNT:
+            raise ValueError(f"{level.name}: ball {i} has invalid goal {ball.goal}")
+        if ball.role is not None and ball.role not in ROLES:
+            raise ValueError(f"{level.name}: ball {i} has unknown role {ball.role!r}")
+    for i in range(len(level.balls)):
+        seen = {i}
+        master = level.balls[i].master
+        while master is not None:
+            if master in seen:
+                raise ValueError(f"{level.name}: ball {i} is in a master cycle")
+            seen.add(master)
+            master = level.balls[master].master
+    for i, gate in enumerate(level.gates):
+        if gate.name not in GATE_NAMES:
+            raise ValueError(f"{level.name}: gate {i} has unknown name {gate.name!r}")
+
+
+def tile_runs(xs, step):
+    """Merge sorted tile positions into (first, last) runs of adjacent tiles."""
+    runs = []
+    for x in xs:
+        if runs and x - runs[-1][1] == step:
+            runs[-1][1] = x
+        else:
+            runs.append([x, x])
+    return [(first, last) for first, last in runs]
+
+
+def _hashed_sprite_list():
+    return arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=GRID_PIXEL_SIZE)
+
+
+def build_scene(level, player_sprite, balls=None):
+    """Build the Scene for a level, with the player drawn first.
+
+    The ball sprites are views onto balls, a BallStore for the level,
+    which is made here if not given.
+
+    The ground is drawn as strips, each one sprite with the tile image
+    repeated along a run of adjacent tiles. Strips are cut at the chunk
+    edges of chunks.ChunkedScene, so each strip lies in one chunk and is
+    culled with it, and a strip texture stays a few tiles wide. For
+    physics, each whole run becomes one invisible rectangle in "Walls",
+    next to the platforms. The number of walls the physics engine checks
+    then does not grow with the map width.
+
+    States, Gates and Items keep a spatial hash with one cell per grid
+    unit, so hit tests against them only look at sprites near the player.
+    """
+    scene = arcade.Scene()
+    scene.add_sprite("Player", player_sprite)
+
+    ground = TEXTURES.get(level.textures["ground"], owner=GAME_TEXTURES)
+    platform = TEXTURES.get(level.textures["platform"], owner=GAME_TEXTURES)
+    tiles = [
+        x for x in range(0, int((level.width + 1) * GRID_PIXEL_SIZE), GRID_PIXEL_SIZE)
+        if x // GRID_PIXEL_SIZE not in level.gaps
+    ]
+    ground_strips = arcade.SpriteList()
+    for first, last in tile_runs(tiles, GRID_PIXEL_SIZE):
+        for _, strip in itertools.groupby(
+            range(first, last + 1, GRID_PIXEL_SIZE), key=chunk_index
+        ):
+            strip = list(strip)
+            texture = TEXTURES.strip(level.textures["ground"], len(strip), owner=GAME_TEXTURES)
+            ground_strips.append(
+                arcade.Sprite(texture, TILE_SCALING, (strip[0] + strip[-1]) / 2, level.ground_y)
+            )
+    scene.add_sprite_list("Ground", sprite_list=ground_strips)
+
+    tile_width = ground.width * TILE_SCALING
+    tile_height = ground.height * TILE_SCALING
+    walls = arcade.SpriteList()
+    for first, last in tile_runs(tiles, GRID_PIXEL_SIZE):
+        wall = arcade.SpriteSolidColor(
+            int(last - first + tile_width), int(tile_height), (first + last) / 2, level.ground_y
+        )
+        wall.visible = False
+        walls.append(wall)
+    walls.extend(arcade.Sprite(platform, TILE_SCALING, x, y) for x, y in level.platforms)
+    scene.add_sprite_list("Walls", sprite_list=walls)
+
+    if balls is None:
+        balls = BallStore(level.balls)
+    sprites = []
+    for ball_id, spec in enumerate(level.balls):
+        ball = QuantumBall(balls, ball_id)
+        ball.scale = spec.scale * ball.base_scale
+        ball.position = spec.x, spec.y
+        ball.message_index = spec.message
+        sprites.append(ball)
+    balls.sprites = tuple(sprites)
+    states = _hashed_sprite_list()
+    states.extend(sprites)
+    scene.add_sprite_list("States", sprite_list=states)
+
+    gates = _hashed_sprite_list()
+    for spec in level.gates:
+        gate = QuantumGate(spec.name)
+        gate.position = spec.x, spec.y
+        gates.append(gate)
+    scene.add_sprite_list("Gates", sprite_list=gates)
+
+    exit_sign = arcade.Sprite(
+        TEXTURES.get(level.textures["exit"], owner=GAME_TEXTURES),
+        TILE_SCALING,
+        level.width * GRID_PIXEL_SIZE,
+        level.exit_y,
+    )
+    items = _hashed_sprite_list()
+    items.append(exit_sign)
+    scene.add_sprite_list("Items", sprite_list=items)
+
+    return scene
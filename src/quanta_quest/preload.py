@@ -0,0 +1,119 @@
+"""Background preparation of a new game for Quanta Quest.
+
+Starting a game needs the level, its sounds and textures, and a fresh
+GameEngine. A Preloader gets these ready while a menu is idle. Files are
+decoded on a worker thread; the work that has to stay on the main thread,
+adding textures to the GPU atlas and building the scene, is done from the
+menu's on_update a few milliseconds at a time. The game's textures are
+owned by GAME_TEXTURES, which is never released, so they and the sounds
+in the SOUNDS bank stay cached for the whole process and a restart only
+has to build a new engine.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+
+from quanta_quest.assets import asset_path, background_path
+from quanta_quest.engine import GameEngine
+from quanta_quest.levels import load_level
+from quanta_quest.solver import GATE_NAMES
+from quanta_quest.sounds import SOUNDS
+from quanta_quest.sprites import (
+    BALL_TEXTURES,
+    GAME_TEXTURES,
+    PLAYER_POSES,
+    PLAYER_TEXTURES,
+    TEXTURES,
+)
+
+# Main-thread time a preloader may use per update, in seconds
+SLICE_SECONDS = 0.004
+
+_executor = None
+
+
+def _submit(func, *args):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(1, thread_name_prefix="preload")
+    return _executor.submit(func, *args)
+
+
+def game_texture_paths(level):
+    """Return the files of the textures the game view's sprites use."""
+    paths = [f"{PLAYER_TEXTURES}_{pose}.png" for pose in PLAYER_POSES]
+    paths += [asset_path(f"{name}.png") for name in BALL_TEXTURES]
+    paths += [asset_path(f"score_{name}.png") for name in GATE_NAMES]
+    paths += [level.textures[key] for key in ("ground", "platform", "exit")]
+    return paths
+
+
+def load_background(window, name, owner=None):
+    """Start decoding the variant of background name that suits window."""
+    return TEXTURES.load_async(
+        background_path(name, *window.get_framebuffer_size()),
+        owner,
+        arcade.hitbox.algo_bounding_box,
+    )
+
+
+class Preloader:
+    """Prepares the next game while another view is shown.
+
+    Call update from the view's on_update, then take once the player
+    starts the game. take finishes whatever is left, so starting early
+    only costs the remaining work.
+    """
+
+    def __init__(self, window, level="main"):
+        self.window = window
+        self.level_name = level
+        self.engine = None
+        self._level = _submit(load_level, level)
+        self._sounds = [_submit(SOUNDS.load, name) for name in SOUNDS.missing()]
+        self._textures = None
+        self._uploaded = 0
+
+    def update(self, budget=SLICE_SECONDS):
+        """Do main-thread work for about budget seconds; return whether the game is ready."""
+        deadline = time.perf_counter() + budget
+        if self._textures is None:
+            if not self._level.done():
+                return False
+            self._textures = [
+                TEXTURES.load_async(path, GAME_TEXTURES)
+                for path in game_texture_paths(self._level.result())
+            ]
+            self._textures.append(load_background(self.window, "main.png", GAME_TEXTURES))
+
+        while self._uploaded < len(self._textures):
+            texture = self._textures[self._uploaded].texture
+            if texture is None:
+                return False
+            self.window.ctx.default_atlas.add(texture)
+            self._uploaded += 1
+            if time.perf_counter() > deadline:
+                return False
+
+        for future in self._sounds:
+            if not future.done():
+                return False
+
+        if self.engine is None:
+            self.engine = GameEngine(self.level_name)
+        return True
+
+    def take(self):
+        """Return the prepared engine, first finishing any work still pending."""
+        self._level.result()
+        self.update(0)
+        for lazy in self._textures:
+            lazy.wait()
+        for future in self._sounds:
+            future.result()
+        self.update(math.inf)
+        engine, self.engine = self.engine, None
+        return engine
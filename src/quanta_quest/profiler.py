@@ -0,0 +1,199 @@
+"""Frame-time profiler for Quanta Quest.
+
+Code marks the parts of a frame it wants timed with
+
+    with PROFILER.section("physics"):
+        ...
+
+and GameView calls PROFILER.next_frame() once per frame. The profiler
+keeps a rolling window of samples per section for p50/p95/p99, counts
+the memory blocks allocated (net of frees) per frame, and records every
+sample in a trace that can be exported as CSV or JSON.
+
+Counts that are not timings, such as how many sprites were culled, are
+reported with PROFILER.count(name, value) and shown with their latest
+value.
+
+Profiling starts enabled when the QUANTA_PROFILE environment variable is
+set, and GameView toggles it with F3 and exports the trace with F4. While
+disabled, section() hands back one shared do-nothing context manager, so
+instrumented code costs a method call per section and nothing else.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import arcade
+
+PROFILE_ENV = "QUANTA_PROFILE"
+PERCENTILES = (50, 95, 99)
+
+
+class _NoSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NO_SECTION = _NoSection()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return None
+
+
+class Profiler:
+    """Rolling per-section frame timings, allocation counts and a trace."""
+
+    def __init__(self, enabled=False, window=600, trace_limit=100_000):
+        self.enabled = enabled
+        self.window = window
+        self.frame = 0
+        self.timings = {}
+        self.counters = {}
+        self.allocations = deque(maxlen=window)
+        self.trace = deque(maxlen=trace_limit)
+        self._frame_start = None
+        self._blocks = 0
+
+    def section(self, name):
+        """Return a context manager that times its body as section name."""
+        if not self.enabled:
+            return _NO_SECTION
+        return _Section(self, name)
+
+    def record(self, name, seconds, allocations=None):
+        """Add a sample of seconds to section name."""
+        ms = seconds * 1000
+        samples = self.timings.get(name)
+        if samples is None:
+            samples = self.timings[name] = deque(maxlen=self.window)
+        samples.append(ms)
+        self.trace.append((self.frame, name, ms, allocations))
+
+    def count(self, name, value):
+        """Set counter name to value for the current frame."""
+        if self.enabled:
+            self.counters[name] = value
+
+    def next_frame(self):
+        """Close the current frame, recording its length and allocations."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        if self._frame_start is not None:
+            allocations = blocks - self._blocks
+            self.allocations.append(allocations)
+            self.record("frame", now - self._frame_start, allocations)
+        self._frame_start = now
+        self._blocks = blocks
+        self.frame += 1
+
+    def toggle(self):
+        """Switch profiling on or off; the frame in progress is not counted."""
+        self.enabled = not self.enabled
+        self._frame_start = None
+
+    def percentiles(self, name):
+        """Return the p50, p95 and p99 of section name's samples in ms."""
+        samples = sorted(self.timings.get(name, ()))
+        if not samples:
+            return (0.0,) * len(PERCENTILES)
+        return tuple(samples[min(len(samples) - 1, len(samples) * p // 100)] for p in PERCENTILES)
+
+    def summary(self):
+        """Return {section: {"p50", "p95", "p99", "count"}} plus allocations per frame."""
+        result = {}
+        for name, samples in self.timings.items():
+            stats = dict(zip((f"p{p}" for p in PERCENTILES), self.percentiles(name)))
+            stats["count"] = len(samples)
+            result[name] = stats
+        allocations = sorted(self.allocations)
+        result["allocations"] = {
+            "p50": allocations[len(allocations) // 2] if allocations else 0,
+            "max": allocations[-1] if allocations else 0,
+        }
+        result["counters"] = dict(self.counters)
+        return result
+
+    def report(self):
+        """Return the summary as lines of text for the overlay."""
+        lines = [f"{'section':12s} {'p50':>6s} {'p95':>6s} {'p99':>6s} ms"]
+        for name in sorted(self.timings):
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:12s} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        allocations = self.summary()["allocations"]
+        lines.append(f"allocs/frame p50 {allocations['p50']}  max {allocations['max']}")
+        for name in sorted(self.counters):
+            lines.append(f"{name:14s} {self.counters[name]}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the trace to path, as JSON if it ends in .json and CSV otherwise."""
+        if str(path).endswith(".json"):
+            data = {
+                "summary": self.summary(),
+                "trace": [
+                    {"frame": frame, "section": name, "ms": ms, "allocations": allocations}
+                    for frame, name, ms, allocations in self.trace
+                ],
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "section", "ms", "allocations"])
+                writer.writerows(self.trace)
+
+
+class ProfilerOverlay:
+    """Draws a profiler's report in a corner of the screen."""
+
+    def __init__(self, profiler, x, y, refresh_frames=30):
+        self.profiler = profiler
+        self.refresh_frames = refresh_frames
+        self._refreshed = None
+        self.text = arcade.Text(
+            "",
+            x,
+            y,
+            arcade.color.WHITE,
+            font_size=12,
+            font_name=("Courier New", "Courier", "monospace"),
+            anchor_y="top",
+            multiline=True,
+            width=420,
+        )
+
+    def draw(self):
+        """Draw the report, re-laying out the text only every refresh_frames frames."""
+        if not self.profiler.enabled:
+            return
+        frame = self.profiler.frame
+        if self._refreshed is None or frame - self._refreshed >= self.refresh_frames:
+            self.text.text = self.profiler.report()
+            self._refreshed = frame
+        self.text.draw()
+
+
+PROFILER = Profiler(enabled=bool(os.environ.get(PROFILE_ENV)))
@@ -0,0 +1,200 @@
+"""Input recording and deterministic replay for Quanta Quest.
+
+GameEngine draws every random choice from a generator seeded with
+GameEngine.seed, and runs in fixed ticks, so a session is fully
+described by its level, its seed and the inputs given at each tick. An
+InputRecorder attached to GameEngine.recorder keeps those inputs, and
+save writes them as a compact binary log:
+
+    header   b"QQIN", version (u8), seed (u64), level name length (u8),
+             level name (UTF-8)
+    records  tick (u32), action (u8), key (u64), modifiers (u16)
+
+all little-endian. The key field is 64 bits wide because pyglet numbers
+keys missing from its key map as scancode << 32. For answer_teleport it
+holds the index of the answer in TELEPORT_CHOICES. Version 1 logs, with
+a 32-bit key field, can still be read.
+
+A Replayer runs a log on a fresh engine as fast as it can simulate,
+taking a snapshot every snapshot_interval ticks, so seek can jump to any
+tick by restoring the nearest snapshot and simulating only the rest.
+
+    python -m quanta_quest.replay session.qqin [--tick N]
+"""
+
+import argparse
+import bisect
+import struct
+import time
+from typing import NamedTuple
+
+from quanta_quest.engine import TELEPORT_CHOICES, GameEngine
+
+MAGIC = b"QQIN"
+VERSION = 2
+ACTIONS = ("key_press", "key_release", "dismiss_message", "answer_teleport")
+
+_HEADER = struct.Struct("<4sBQB")
+_RECORD = struct.Struct("<IBQH")
+# Record layout of each version that can be read
+_RECORDS = {1: struct.Struct("<IBIH"), VERSION: _RECORD}
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class InputRecord(NamedTuple):
+    tick: int
+    action: str
+    key: int = 0
+    modifiers: int = 0
+
+
+class InputLog(NamedTuple):
+    seed: int
+    level: str
+    records: list
+
+
+class InputRecorder:
+    """Collects the inputs an engine receives; attach with engine.recorder = recorder."""
+
+    def __init__(self, seed, level="main"):
+        self.seed = seed
+        self.level = level
+        self.records = []
+
+    @classmethod
+    def attach(cls, engine):
+        """Create a recorder for engine's session and start recording it."""
+        recorder = cls(engine.seed, engine.level.name)
+        engine.recorder = recorder
+        return recorder
+
+    def log(self, tick, action, key=0, modifiers=0):
+        """Add an input given before the update of tick."""
+        self.records.append(InputRecord(tick, action, key, modifiers))
+
+    def to_log(self):
+        return InputLog(self.seed, self.level, list(self.records))
+
+    def save(self, path):
+        """Write the log to path."""
+        with open(path, "wb") as f:
+            f.write(dump_log(self.to_log()))
+
+
+def dump_log(log):
+    """Return log encoded in the binary format."""
+    level = log.level.encode("utf-8")
+    parts = [_HEADER.pack(MAGIC, VERSION, log.seed, len(level)), level]
+    for record in log.records:
+        parts.append(
+            _RECORD.pack(record.tick, _ACTION_CODES[record.action], record.key, record.modifiers)
+        )
+    return b"".join(parts)
+
+
+def parse_log(data):
+    """Decode a log from bytes in the binary format."""
+    magic, version, seed, length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a Quanta Quest input log")
+    record = _RECORDS.get(version)
+    if record is None:
+        raise ValueError(f"unsupported input log version {version}")
+    offset = _HEADER.size
+    level = data[offset:offset + length].decode("utf-8")
+    offset += length
+    if (len(data) - offset) % record.size:
+        raise ValueError("truncated input log")
+    records = [
+        InputRecord(tick, ACTIONS[action], key, modifiers)
+        for tick, action, key, modifiers in record.iter_unpack(data[offset:])
+    ]
+    return InputLog(seed, level, records)
+
+
+def load_log(path):
+    """Read a log written by InputRecorder.save."""
+    with open(path, "rb") as f:
+        return parse_log(f.read())
+
+
+class Replayer:
+    """Re-simulates a logged session on a new engine, with seeking."""
+
+    def __init__(self, log, snapshot_interval=600):
+        self.log = log
+        self.snapshot_interval = snapshot_interval
+        self.engine = GameEngine(log.level, seed=log.seed)
+        self._ticks = [record.tick for record in log.records]
+        self._next = 0
+        self.snapshots = {0: self.engine.snapshot()}
+
+    @property
+    def tick(self):
+        return self.engine.ticks
+
+    @property
+    def end_tick(self):
+        """The tick of the last logged input."""
+        return self._ticks[-1] if self._ticks else 0
+
+    def _apply(self, record):
+        engine = self.engine
+        if record.action == "answer_teleport":
+            engine.answer_teleport(TELEPORT_CHOICES[record.key])
+        elif record.action == "dismiss_message":
+            engine.dismiss_message()
+        else:
+            getattr(engine, record.action)(record.key, record.modifiers)
+
+    def step(self):
+        """Apply the inputs of the current tick and simulate it."""
+        engine = self.engine
+        records = self.log.records
+        while self._next < len(records) and records[self._next].tick <= engine.ticks:
+            self._apply(records[self._next])
+            self._next += 1
+        engine.update()
+        # Nothing presents events during a replay
+        engine.events.clear()
+        if engine.ticks % self.snapshot_interval == 0 and engine.ticks not in self.snapshots:
+            self.snapshots[engine.ticks] = engine.snapshot()
+
+    def run_to(self, tick):
+        """Simulate forward until tick, or until the game ends."""
+        engine = self.engine
+        while engine.ticks < tick and not engine.game_over:
+            self.step()
+        return engine
+
+    def seek(self, tick):
+        """Bring the engine to tick, going back to a snapshot if it is behind."""
+        if tick < self.engine.ticks:
+            start = max(t for t in self.snapshots if t <= tick)
+            self.engine.restore(self.snapshots[start])
+            self._next = bisect.bisect_left(self._ticks, start)
+        return self.run_to(tick)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a Quanta Quest input log.")
+    parser.add_argument("log")
+    parser.add_argument("--tick", type=int, help="stop at this tick (default: last input)")
+    args = parser.parse_args(argv)
+
+    log = load_log(args.log)
+    replayer = Replayer(log)
+    target = args.tick if args.tick is not None else replayer.end_tick + 1
+    start = time.perf_counter()
+    engine = replayer.seek(target)
+    elapsed = time.perf_counter() - start
+    player = engine.player_sprite
+    print(f"level {log.level}  seed {log.seed}  inputs {len(log.records)}")
+    print(f"tick {engine.ticks} in {elapsed:.2f} s ({engine.ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"player ({player.center_x:.1f}, {player.center_y:.1f})  gates {engine.collected_gates}")
+    print(f"balls {engine.balls.states.tolist()}  game over {engine.game_over}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Fixed-timestep scheduling for Quanta Quest.
+
+The game simulates in fixed ticks of TICK_SECONDS, whatever the display
+rate. FixedTimestep turns the variable frame times arcade reports into
+a whole number of ticks per frame. A fast display gets frames with no
+tick at all, and a slow one gets several ticks per frame, up to a cap
+past which the backlog is dropped rather than let it grow. The leftover
+fraction of a tick is exposed as alpha for render interpolation.
+
+Timer measures durations in seconds on top of the same ticks, so game
+timing does not depend on the frame rate either.
+"""
+
+from quanta_quest.constants import MAX_CATCH_UP_TICKS, TICK_RATE, TICK_SECONDS
+
+# Slack for frame times that add up to a whole tick only up to rounding
+_EPSILON = 1e-9
+
+
+class FixedTimestep:
+    """Accumulates frame time and hands it out in fixed ticks.
+
+    A frame that covers max_steps ticks or more sets behind. Below
+    TICK_RATE / max_steps frames per second (12 at the defaults) the ticks
+    past the cap are dropped and counted in dropped_ticks, so the game runs
+    slower than real time. GameView reacts to behind by skipping render
+    work, which leaves more time for ticks and raises the frame rate.
+    """
+
+    def __init__(self, step=TICK_SECONDS, max_steps=MAX_CATCH_UP_TICKS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self.behind = False
+
+    def advance(self, delta_time):
+        """Add a frame of delta_time seconds and return how many ticks to run."""
+        self.accumulator += delta_time
+        steps = int((self.accumulator + _EPSILON) // self.step)
+        self.accumulator = max(0.0, self.accumulator - steps * self.step)
+        self.behind = steps >= self.max_steps
+        if steps > self.max_steps:
+            self.dropped_ticks += steps - self.max_steps
+            steps = self.max_steps
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """How far the display is between the last tick and the next, from 0 to 1."""
+        return min(self.accumulator / self.step, 1.0)
+
+
+class Timer:
+    """Fires once a duration in seconds has passed, counted in fixed ticks."""
+
+    def __init__(self, seconds, repeat=False):
+        self.duration = max(1, round(seconds * TICK_RATE))
+        self.repeat = repeat
+        self.elapsed = 0
+        self.running = False
+
+    def start(self):
+        """Start counting from zero."""
+        self.elapsed = 0
+        self.running = True
+
+    def tick(self):
+        """Advance one tick and return whether the timer fired."""
+        if not self.running:
+            return False
+        self.elapsed += 1
+        if self.elapsed < self.duration:
+            return False
+        self.elapsed = 0
+        self.running = self.repeat
+        return True
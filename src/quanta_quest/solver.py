@@ -0,0 +1,161 @@
+"""Puzzle solver for Quanta Quest.
+
+A puzzle is a small group of balls, some of them masters of others, and a
+gate inventory. The solver runs a breadth-first search over (ball states,
+gates left) using the gate_manipulator transition tables, so its answers
+follow exactly the rules the game plays by. The search from one start and
+inventory is cached, after which any goal is a dictionary lookup.
+
+States are tuples with one gate_manipulator index per ball. masters gives,
+for each ball, the position of its master in the same tuple, or None. A
+step is a (gate, ball) pair: apply gate to the ball at that position.
+
+The game simulates linked balls exactly with gate_manipulator.LinkedStates.
+Their states match the tables until a CNOT has a superposed master. After
+that, a gate can also change how other balls of the group show, for
+example a phase kicked back onto a master, which the tables do not model.
+"""
+
+from collections import deque
+from functools import lru_cache
+
+from quanta_quest.constants import GATES_PER_PICKUP
+from quanta_quest.gate_manipulator import gate_on_state
+
+GATE_NAMES = ("X", "Z", "H", "C")
+STATE_COUNT = 8
+
+
+def _inventory_key(inventory):
+    """Turn a collected_gates dict or a count tuple into a count tuple."""
+    if isinstance(inventory, dict):
+        return tuple(inventory.get(gate, 0) for gate in GATE_NAMES)
+    return tuple(inventory)
+
+
+def _normalise(states, masters):
+    if isinstance(states, int):
+        states = (states,)
+    states = tuple(states)
+    if masters is None:
+        masters = (None,) * len(states)
+    return states, tuple(masters)
+
+
+@lru_cache(maxsize=1024)
+def _search(start, inventory, masters):
+    """Return {states: steps} with a shortest step tuple to each reachable state."""
+    # A shortest path never visits the same ball states twice, so it uses
+    # fewer gates than there are state combinations; higher counts add
+    # nothing. Reaching some states again with no more of every gate left
+    # than an earlier visit can't lead anywhere new either, so only visits
+    # that keep more of some gate are expanded.
+    cap = STATE_COUNT ** len(start) - 1
+    inventory = tuple(min(count, cap) for count in inventory)
+
+    parents = {(start, inventory): None}
+    first = {start: (start, inventory)}
+    seen = {start: [inventory]}
+    queue = deque([(start, inventory)])
+    while queue:
+        node = queue.popleft()
+        states, counts = node
+        for g, gate in enumerate(GATE_NAMES):
+            if not counts[g]:
+                continue
+            left = counts[:g] + (counts[g] - 1,) + counts[g + 1:]
+            for ball, state in enumerate(states):
+                if gate == "C":
+                    if masters[ball] is None:
+                        continue
+                    new_state = gate_on_state(state, gate, states[masters[ball]])
+                else:
+                    new_state = gate_on_state(state, gate)
+                if new_state == state:
+                    continue
+                new_states = states[:ball] + (new_state,) + states[ball + 1:]
+                visits = seen.setdefault(new_states, [])
+                if any(all(a >= b for a, b in zip(other, left)) for other in visits):
+                    continue
+                visits.append(left)
+                child = (new_states, left)
+                parents[child] = (node, (gate, ball))
+                first.setdefault(new_states, child)
+                queue.append(child)
+
+    paths = {}
+    for states, node in first.items():
+        steps = []
+        while parents[node] is not None:
+            node, step = parents[node]
+            steps.append(step)
+        paths[states] = tuple(reversed(steps))
+    return paths
+
+
+def reachable(start, inventory, masters=None):
+    """Return {states: steps} for every ball state the inventory can reach."""
+    start, masters = _normalise(start, masters)
+    return _search(start, _inventory_key(inventory), masters)
+
+
+@lru_cache(maxsize=4096)
+def _shortest(start, goal, inventory, masters):
+    best = None
+    for states, steps in _search(start, inventory, masters).items():
+        if all(want is None or want == have for want, have in zip(goal, states)):
+            if best is None or len(steps) < len(best):
+                best = steps
+    return best
+
+
+def shortest_sequence(start, goal, inventory, masters=None):
+    """Return the shortest steps taking start to goal, or None if there are none.
+
+    goal has one entry per ball; None means that ball may end in any state.
+    inventory is a collected_gates dict or a tuple of counts in GATE_NAMES
+    order.
+    """
+    start, masters = _normalise(start, masters)
+    goal, _ = _normalise(goal, masters)
+    return _shortest(start, goal, _inventory_key(inventory), masters)
+
+
+def puzzles(level):
+    """Yield (ball indices, masters) for each group of linked balls with a goal."""
+    groups = {}
+    for i in range(len(level.balls)):
+        root = i
+        while level.balls[root].master is not None:
+            root = level.balls[root].master
+        groups.setdefault(root, []).append(i)
+    for members in groups.values():
+        if any(level.balls[i].goal is not None for i in members):
+            members.sort()
+            masters = tuple(
+                None if level.balls[i].master is None else members.index(level.balls[i].master)
+                for i in members
+            )
+            yield tuple(members), masters
+
+
+def check_level(level):
+    """Return a message for every puzzle in level that cannot be solved.
+
+    Each puzzle is solved on its own with the gates lying at or before its
+    rightmost ball, so this catches missing or misplaced gates but not
+    two puzzles competing for the same pickup.
+    """
+    problems = []
+    for members, masters in puzzles(level):
+        specs = [level.balls[i] for i in members]
+        right = max(spec.x for spec in specs)
+        inventory = tuple(
+            GATES_PER_PICKUP * sum(1 for gate in level.gates if gate.name == name and gate.x <= right)
+            for name in GATE_NAMES
+        )
+        start = tuple(spec.state for spec in specs)
+        goal = tuple(spec.goal for spec in specs)
+        if shortest_sequence(start, goal, inventory, masters) is None:
+            problems.append(f"{level.name}: balls {list(members)} cannot reach goal {list(goal)}")
+    return problems
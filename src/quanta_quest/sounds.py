@@ -0,0 +1,94 @@
+"""Sound effects for Quanta Quest.
+
+A SoundBank decodes each clip once per process and keeps the decoded
+sounds for every later game. Playing is throttled: a clip asked for again
+within coalesce seconds of its last start is skipped, and no more than
+max_voices clips play at the same time. A voice counts as active until
+its clip's length has passed, so the bank never has to poll the audio
+backend.
+"""
+
+import time
+
+import arcade
+
+GAME_SOUNDS = {
+    "coin": ":resources:sounds/coin1.wav",
+    "jump": ":resources:sounds/jump1.wav",
+    "game_over": ":resources:sounds/gameover1.wav",
+    "shoot": ":resources:sounds/hurt5.wav",
+    "hit": ":resources:sounds/hit5.wav",
+    "hurt": ":resources:sounds/explosion2.wav",
+}
+
+
+class SoundBank:
+    """Decoded sounds by name, with voice limiting and repeat coalescing."""
+
+    def __init__(self, paths, max_voices=8, coalesce=0.08, clock=time.monotonic):
+        self.paths = dict(paths)
+        self.max_voices = max_voices
+        self.coalesce = coalesce
+        self.clock = clock
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._sounds = {}
+        self._last_start = {}
+        self._voice_ends = []
+
+    def load(self, name):
+        """Return the decoded sound for name, decoding it on first use."""
+        sound = self._sounds.get(name)
+        if sound is None:
+            sound = self._sounds[name] = arcade.load_sound(self.paths[name])
+        return sound
+
+    def missing(self):
+        """Return the names of the sounds not decoded yet."""
+        return [name for name in self.paths if name not in self._sounds]
+
+    def active_voices(self):
+        """Return how many clips are still playing."""
+        now = self.clock()
+        self._voice_ends = [end for end in self._voice_ends if end > now]
+        return len(self._voice_ends)
+
+    def play(self, name, volume=1.0):
+        """Play the sound for name unless it is a repeat or all voices are busy.
+
+        Returns the player, or None if the sound was skipped.
+        """
+        now = self.clock()
+        last = self._last_start.get(name)
+        if last is not None and now - last < self.coalesce:
+            self.coalesced += 1
+            return None
+        if self.active_voices() >= self.max_voices:
+            self.dropped += 1
+            return None
+        sound = self.load(name)
+        self._last_start[name] = now
+        self._voice_ends.append(now + sound.get_length())
+        self.played += 1
+        return arcade.play_sound(sound, volume)
+
+    def stats(self):
+        """Return decoded clip count and bytes, active voices and play counts."""
+        decoded = 0
+        for sound in self._sounds.values():
+            audio = sound.source.audio_format
+            decoded += int(
+                sound.get_length() * audio.sample_rate * audio.channels * audio.sample_size // 8
+            )
+        return {
+            "clips": len(self._sounds),
+            "decoded_bytes": decoded,
+            "active_voices": self.active_voices(),
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+
+SOUNDS = SoundBank(GAME_SOUNDS)
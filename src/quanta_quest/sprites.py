@@ -1,8 +1,12 @@
 """Sprite classes for Quanta Quest."""
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import arcade
+from PIL import Image
 
-from quanta_quest.assets import asset_path
+from quanta_quest.assets import asset_path, atlas_region
 from quanta_quest.constants import (
     BALL_SCALING,
     CHARACTER_SCALING,
@@ -12,43 +16,252 @@ from quanta_quest.constants import (
 )
 
 
-def load_texture_vpair(filename):
+# Owner scope for textures used by the game view and its sprites
+GAME_TEXTURES = "game"
+
+# Ball textures, in state order, and the stem of the player's textures
+BALL_TEXTURES = ("ball_white", "ball_black", "ball_up_up", "ball_up_down")
+PLAYER_TEXTURES = ":resources:images/animated_characters/female_person/femalePerson"
+PLAYER_POSES = ("idle", "jump", "fall") + tuple(f"walk{i}" for i in range(8))
+
+
+class TextureRegistry:
+    """Process-wide texture cache shared by all sprites.
+
+    Textures are keyed by file path and flip variant ("horizontal",
+    "vertical" or None), so each variant is decoded once and every sprite
+    gets the same texture object. Lookups may be tagged with an owner scope,
+    such as GAME_TEXTURES or a view. GAME_TEXTURES is never released, since
+    every restart needs the same textures again. When a view's scope is
+    released, textures no other scope uses move to an idle pool, so a view
+    shown again soon can pick them up. The least recently used idle
+    textures are dropped once the pool holds more than max_idle. Textures
+    loaded without an owner are never released.
+
+    Assets packed into a texture atlas are cut from the atlas image, which
+    is decoded once for all of its regions. Large images can be decoded on
+    a worker thread with load_async instead of blocking the caller.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._textures = {}
+        self._owners = {}
+        self._idle = OrderedDict()
+        self._sheets = {}
+        self._pending = {}
+        self._executor = None
+
+    def get(self, path, flip=None, owner=None):
+        """Return the texture for path, flipped "horizontal"ly or "vertical"ly."""
+        key = (path, flip)
+        texture = self._textures.get(key)
+        if texture is None:
+            self.misses += 1
+            if flip is None:
+                texture = self._decode(path)
+            else:
+                base = self.get(path, owner=owner)
+                texture = getattr(base, f"flip_{flip}ly")()
+            self._textures[key] = texture
+        else:
+            self.hits += 1
+        self._idle.pop(key, None)
+        self._owners.setdefault(key, set()).add(owner)
+        return texture
+
+    def strip(self, path, count, owner=None):
+        """Return a texture of path's image repeated count times side by side."""
+        key = (path, f"strip{count}")
+        texture = self._textures.get(key)
+        if texture is None:
+            self.misses += 1
+            tile = self.get(path, owner=owner).image
+            image = Image.new(tile.mode, (tile.width * count, tile.height))
+            for i in range(count):
+                image.paste(tile, (i * tile.width, 0))
+            texture = arcade.Texture(
+                image, hit_box_algorithm=arcade.hitbox.algo_bounding_box, hash=f"{path}|{key[1]}"
+            )
+            self._textures[key] = texture
+        else:
+            self.hits += 1
+        self._idle.pop(key, None)
+        self._owners.setdefault(key, set()).add(owner)
+        return texture
+
+    def _decode(self, path, hit_box_algorithm=None):
+        region = atlas_region(path)
+        if region is None:
+            return arcade.load_texture(path, hit_box_algorithm=hit_box_algorithm)
+        sheet = self._sheets.get(region.image)
+        if sheet is None:
+            sheet = self._sheets.setdefault(region.image, arcade.load_spritesheet(region.image))
+        return sheet.get_texture(
+            arcade.LBWH(region.x, region.y, region.width, region.height), hit_box_algorithm
+        )
+
+    def load_async(self, path, owner=None, hit_box_algorithm=None):
+        """Start decoding path on a worker thread and return a LazyTexture for it.
+
+        Pass arcade.hitbox.algo_bounding_box for images that never collide
+        to skip tracing their outline.
+        """
+        future = self._pending.get(path)
+        if future is None:
+            cached = self._textures.get((path, None))
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(1, thread_name_prefix="texture-decode")
+                future = self._pending[path] = self._executor.submit(
+                    self._decode, path, hit_box_algorithm
+                )
+        return LazyTexture(self, path, owner, future)
+
+    def _adopt(self, path, texture, owner):
+        """Cache a texture decoded by load_async, unless path was loaded meanwhile."""
+        self._pending.pop(path, None)
+        key = (path, None)
+        cached = self._textures.get(key)
+        if cached is None:
+            self.misses += 1
+            self._textures[key] = cached = texture
+        else:
+            self.hits += 1
+        self._idle.pop(key, None)
+        self._owners.setdefault(key, set()).add(owner)
+        return cached
+
+    def release(self, owner):
+        """Release every texture held by owner, evicting idle overflow."""
+        held = [key for key, owners in self._owners.items() if owner in owners]
+        for key in held:
+            owners = self._owners[key]
+            owners.discard(owner)
+            if not owners:
+                del self._owners[key]
+                self._idle[key] = None
+        while len(self._idle) > self.max_idle:
+            key, _ = self._idle.popitem(last=False)
+            del self._textures[key]
+
+    def evict_idle(self):
+        """Drop all textures no active owner is using."""
+        for key in self._idle:
+            del self._textures[key]
+        self._idle.clear()
+
+    def stats(self):
+        """Return hit/miss counts and the number of cached and idle textures."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "textures": len(self._textures),
+            "idle": len(self._idle),
+        }
+
+
+class LazyTexture:
+    """A texture from TextureRegistry.load_async.
+
+    texture is None until the worker thread has decoded the image. The
+    first access after that adds it to the registry on the calling thread.
+    """
+
+    def __init__(self, registry, path, owner, future):
+        self._registry = registry
+        self._path = path
+        self._owner = owner
+        self._future = future
+        self._texture = None
+
+    @property
+    def texture(self):
+        if self._texture is None and self._future.done():
+            self._texture = self._registry._adopt(self._path, self._future.result(), self._owner)
+        return self._texture
+
+    def wait(self):
+        """Block until the texture is decoded and return it."""
+        self._future.result()
+        return self.texture
+
+
+TEXTURES = TextureRegistry()
+
+
+def texture_scale(path):
+    """Return the scale path's texture was rasterized at; 1.0 unless it is an atlas region."""
+    region = atlas_region(path)
+    return 1.0 if region is None else region.scale
+
+
+def load_texture_vpair(filename, owner=None):
     """Load a texture pair, with the second being a vertical mirror image."""
-    tex = arcade.load_texture(filename)
-    return [tex, tex.flip_vertically()]
+    return [TEXTURES.get(filename, owner=owner),
+            TEXTURES.get(filename, "vertical", owner=owner)]
 
 
-def load_texture_pair(filename):
+def load_texture_pair(filename, owner=None):
     """Load a texture pair, with the second being a horizontal mirror image."""
-    tex = arcade.load_texture(filename)
-    return [tex, tex.flip_horizontally()]
+    return [TEXTURES.get(filename, owner=owner),
+            TEXTURES.get(filename, "horizontal", owner=owner)]
 
 
 class QuantumGate(arcade.Sprite):
     def __init__(self, name):
         super().__init__()
         self.name = name
-        self.scale = GATE_SCALING
-        self.texture = arcade.load_texture(asset_path(f"score_{name}.png"))
+        path = asset_path(f"score_{name}.png")
+        self.scale = GATE_SCALING / texture_scale(path)
+        self.texture = TEXTURES.get(path, owner=GAME_TEXTURES)
 
 
 class QuantumBall(arcade.Sprite):
+    """A ball drawn from the state kept for ball_id in a BallStore."""
 
-    def __init__(self, idle_state):
+    def __init__(self, store, ball_id):
         super().__init__()
 
-        self.scale = BALL_SCALING
-        self.master = None
+        # Scale that draws the ball at BALL_SCALING whatever its texture size
+        self.base_scale = BALL_SCALING / texture_scale(asset_path("ball_white.png"))
+        self.scale = self.base_scale
+        self.store = store
+        self.ball_id = ball_id
         self.message_index = None
         self.textures = []
-        self.textures += load_texture_vpair(asset_path("ball_white.png"))
-        self.textures += load_texture_vpair(asset_path("ball_black.png"))
-        self.textures += load_texture_vpair(asset_path("ball_up_up.png"))
-        self.textures += load_texture_vpair(asset_path("ball_up_down.png"))
+        for name in BALL_TEXTURES:
+            self.textures += load_texture_vpair(asset_path(f"{name}.png"), GAME_TEXTURES)
 
-        self.state = idle_state
         self.texture = self.textures[self.state]
 
+    @property
+    def state(self):
+        return int(self.store.states[self.ball_id])
+
+    @state.setter
+    def state(self, value):
+        self.store.set_state(self.ball_id, value)
+
+    @property
+    def master(self):
+        master = self.store.masters[self.ball_id]
+        return None if master < 0 else self.store.sprites[master]
+
+    @property
+    def goal(self):
+        goal = self.store.goals[self.ball_id]
+        return None if goal < 0 else int(goal)
+
+    @property
+    def role(self):
+        return self.store.roles[self.ball_id]
+
     def update_animation(self, delta_time: float = 1 / 60):
         self.texture = self.textures[self.state]
 
@@ -64,15 +277,15 @@ class PlayerCharacter(arcade.Sprite):
         self.scale = CHARACTER_SCALING
         self.jumping = False
 
-        main_path = ":resources:images/animated_characters/female_person/femalePerson"
+        main_path = PLAYER_TEXTURES
 
-        self.idle_texture_pair = load_texture_pair(f"{main_path}_idle.png")
-        self.jump_texture_pair = load_texture_pair(f"{main_path}_jump.png")
-        self.fall_texture_pair = load_texture_pair(f"{main_path}_fall.png")
+        self.idle_texture_pair = load_texture_pair(f"{main_path}_idle.png", GAME_TEXTURES)
+        self.jump_texture_pair = load_texture_pair(f"{main_path}_jump.png", GAME_TEXTURES)
+        self.fall_texture_pair = load_texture_pair(f"{main_path}_fall.png", GAME_TEXTURES)
 
         self.walk_textures = []
         for i in range(8):
-            texture = load_texture_pair(f"{main_path}_walk{i}.png")
+            texture = load_texture_pair(f"{main_path}_walk{i}.png", GAME_TEXTURES)
             self.walk_textures.append(texture)
 
         self.texture = self.idle_texture_pair[0]
@@ -0,0 +1,274 @@
+"""Multi-qubit statevector simulation for Quanta Quest.
+
+QubitRegister holds the joint state of n linked balls as a NumPy array of
+shape (2,) * n, with qubit 0 on the first axis, so the flattened array is
+the usual big-endian statevector. Gates work in place on strided views
+along one axis, so nothing larger than the state itself is ever built.
+
+gate_manipulator's eight states tell apart vectors that differ only in
+sign, such as |0⟩ and -|0⟩. In a product state only the product of the
+qubits' signs is fixed. So the register also keeps the state index of
+each qubit it knows to be unentangled, and keeps it up to date through
+one-qubit gates, CNOTs on definite controls and measurements. The state
+always equals the product of those qubits' basis vectors with the state
+of the remaining qubits, which carry any leftover phase.
+
+The game reaches the register through gate_manipulator.LinkedStates,
+which BallStore keeps for each group of balls linked through masters.
+"""
+
+import itertools
+
+import numpy as np
+
+from quanta_quest.gate_manipulator import (
+    _BASIS_STATES,
+    _R,
+    _Hgate,
+    _Sgate,
+    _Xgate,
+    _Zgate,
+    gate_on_state,
+)
+
+GATES = {"X": _Xgate, "Z": _Zgate, "H": _Hgate, "S": _Sgate}
+
+# Indices of |0⟩ and |1⟩ up to sign, by bit
+_DEFINITE = ((0, 1), (2, 3))
+
+
+def basis_index(vector, atol=1e-6):
+    """Return the gate_manipulator index of a one-qubit vector, or None if it is none of them."""
+    distance = np.abs(_BASIS_STATES - vector).max(axis=1)
+    index = int(np.argmin(distance))
+    return index if distance[index] < atol else None
+
+
+class QubitRegister:
+    """Joint state of n qubits."""
+
+    def __init__(self, num_qubits, rng=None):
+        self.num_qubits = num_qubits
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.state = np.zeros((2,) * num_qubits, dtype=complex)
+        self.state[(0,) * num_qubits] = 1
+        # State index of each qubit known to be unentangled, else None
+        self.known = [0] * num_qubits
+        self._buffers = np.empty((2, 2 ** max(num_qubits - 1, 0)), dtype=complex)
+
+    @classmethod
+    def from_states(cls, state_numbers, rng=None):
+        """Build a register from one gate_manipulator state index per qubit."""
+        register = cls(len(state_numbers), rng)
+        vector = np.ones(1, dtype=complex)
+        for state_number in state_numbers:
+            vector = np.kron(vector, _BASIS_STATES[state_number])
+        register.state[...] = vector.reshape(register.state.shape)
+        register.known = [int(state_number) for state_number in state_numbers]
+        return register
+
+    def _half(self, qubit, bit, fixed=()):
+        """View of the part of the state where qubit is bit.
+
+        fixed holds (qubit, bit) pairs that further restrict the view. The
+        state is reshaped so that each named qubit keeps its own axis and
+        every run of other qubits is merged into one axis. That keeps the
+        view at a few dimensions however large the register gets.
+        """
+        bits = dict(fixed)
+        bits[qubit] = bit
+        shape = []
+        index = []
+        previous = -1
+        for named in sorted(bits):
+            shape += [2 ** (named - previous - 1), 2]
+            index += [slice(None), slice(bits[named], bits[named] + 1)]
+            previous = named
+        shape.append(2 ** (self.num_qubits - previous - 1))
+        index.append(slice(None))
+        return self.state.reshape(shape)[tuple(index)]
+
+    def apply_gate(self, gate, qubit, controls=()):
+        """Apply a one-qubit gate, by name or 2x2 matrix, to qubit in place.
+
+        controls lists qubits that must all be 1 for the gate to act.
+        """
+        self._track(gate, qubit, controls)
+        fixed = [(control, 1) for control in controls]
+        zero = self._half(qubit, 0, fixed)
+        one = self._half(qubit, 1, fixed)
+        if isinstance(gate, str):
+            if gate == "X":
+                old_zero = self._scratch(0, zero)
+                zero[...] = one
+                one[...] = old_zero
+                return
+            if gate == "Z":
+                one *= -1
+                return
+            if gate == "H":
+                old_zero = self._scratch(0, zero)
+                zero += one
+                zero *= _R
+                one -= old_zero
+                one *= -_R
+                return
+            gate = GATES[gate]
+        (m00, m01), (m10, m11) = gate
+        if m01 == 0 and m10 == 0:
+            zero *= m00
+            one *= m11
+            return
+        old_zero = self._scratch(0, zero)
+        term = self._scratch(1, one)
+        term *= m01
+        zero *= m00
+        zero += term
+        one *= m11
+        old_zero *= m10
+        one += old_zero
+
+    def _track(self, gate, qubit, controls):
+        """Update the known state indices for a gate about to be applied."""
+        known = self.known
+        if controls:
+            definite = [known[c] in _DEFINITE[0] + _DEFINITE[1] for c in controls]
+            if not all(definite):
+                # The gate may entangle the controls with the target
+                for q in (qubit, *controls):
+                    known[q] = None
+                return
+            if not all(known[c] in _DEFINITE[1] for c in controls):
+                return
+        if known[qubit] is None:
+            return
+        if isinstance(gate, str):
+            # The transition tables give named gates' results exactly
+            known[qubit] = gate_on_state(known[qubit], gate)
+        else:
+            known[qubit] = basis_index(np.asarray(gate) @ _BASIS_STATES[known[qubit]])
+
+    def _scratch(self, slot, values):
+        """Copy values into a reusable buffer and return the copy.
+
+        The buffers are allocated once per register. Allocating a fresh
+        temporary for every gate is several times slower for large
+        registers, because each new allocation has to fault in fresh pages.
+        """
+        buffer = self._buffers[slot, :values.size].reshape(values.shape)
+        buffer[...] = values
+        return buffer
+
+    def cnot(self, control, target):
+        """Flip target wherever control is 1."""
+        self.apply_gate("X", target, (control,))
+
+    def probabilities(self, qubits=None):
+        """Return outcome probabilities of qubits (all by default), shape (2,) * k."""
+        probs = np.abs(self.state) ** 2
+        if qubits is None:
+            return probs
+        others = tuple(q for q in range(self.num_qubits) if q not in qubits)
+        marginal = probs.sum(axis=others)
+        # sum() keeps the remaining axes in ascending order; reorder to match qubits
+        order = sorted(qubits)
+        return np.transpose(marginal, [order.index(q) for q in qubits])
+
+    def measure(self, qubits):
+        """Measure qubits together, collapse the state and return their bits."""
+        probs = self.probabilities(qubits).ravel()
+        outcome = self.rng.choice(len(probs), p=probs / probs.sum())
+        bits = tuple(int(b) for b in np.unravel_index(outcome, (2,) * len(qubits)))
+        for qubit, bit in zip(qubits, bits):
+            self._half(qubit, 1 - bit)[...] = 0
+            known = self.known[qubit]
+            if known is None:
+                # The collapsed qubit is |bit⟩; the rest of the state keeps the phase
+                self.known[qubit] = _DEFINITE[bit][0]
+            else:
+                vector = _BASIS_STATES[known].copy()
+                vector[1 - bit] = 0
+                self.known[qubit] = basis_index(vector / np.abs(vector[bit]))
+        self.state /= np.sqrt(probs[outcome])
+        return bits
+
+    def bell_measure(self, first, second):
+        """Measure two qubits in the Bell basis and return their two bits."""
+        self.cnot(first, second)
+        self.apply_gate("H", first)
+        return self.measure((first, second))
+
+    def is_entangled(self, qubit, tol=1e-9):
+        """Return whether qubit, or a tuple of qubits, is entangled with the rest."""
+        qubits = (qubit,) if isinstance(qubit, int) else tuple(qubit)
+        if all(self.known[q] is not None for q in qubits):
+            return False
+        matrix = np.moveaxis(self.state, qubits, range(len(qubits))).reshape(2 ** len(qubits), -1)
+        rho = matrix @ matrix.conj().T
+        purity = np.real(np.trace(rho @ rho))
+        return purity < 1 - tol
+
+    def qubit_state(self, qubit, tol=1e-9):
+        """Return the gate_manipulator index of an unentangled qubit, else None.
+
+        A qubit whose index is not known yet is factored out of the state
+        once the known qubits are divided out. If it is the only unknown
+        qubit left, that gives its sign exactly. Otherwise the sign is
+        shared with the other unknown qubits, and the largest amplitude of
+        theirs is taken as positive. Either way the result is remembered,
+        so later reads and gates stay consistent with it.
+        """
+        if self.known[qubit] is not None:
+            return self.known[qubit]
+        if self.is_entangled(qubit, tol):
+            return None
+        rest = self.state
+        position = 0
+        # Highest axis first, so the axes still to go keep their numbers
+        for other in reversed(range(self.num_qubits)):
+            known = self.known[other]
+            if other == qubit:
+                continue
+            if known is None:
+                position += other < qubit
+                continue
+            rest = np.tensordot(rest, _BASIS_STATES[known].conj(), axes=([other], [0]))
+        matrix = np.moveaxis(rest, position, 0).reshape(2, -1)
+        column = matrix[:, np.argmax(np.abs(matrix).max(axis=0))]
+        index = basis_index(column / np.linalg.norm(column))
+        self.known[qubit] = index
+        return index
+
+
+def verify_register():
+    """Check QubitRegister against the gate_manipulator tables.
+
+    Covers reading back every three-qubit product state, every one-qubit
+    gate and CNOT on a definite master, and recovering a qubit's sign by
+    factoring it out of the state. Returns a list of mismatches, which is
+    empty when the register agrees with the tables.
+    """
+    mismatches = []
+    for states in itertools.product(range(len(_BASIS_STATES)), repeat=3):
+        register = QubitRegister.from_states(states)
+        result = [register.qubit_state(q) for q in range(3)]
+        if result != list(states):
+            mismatches.append(("from_states", states, result))
+        # Forget qubit 1 and factor it out of the state instead
+        register.known[1] = None
+        if register.qubit_state(1) != states[1]:
+            mismatches.append(("factor", states, register.qubit_state(1)))
+    for state in range(len(_BASIS_STATES)):
+        for gate in ("X", "Z", "H"):
+            register = QubitRegister.from_states([state])
+            register.apply_gate(gate, 0)
+            expected = gate_on_state(state, gate)
+            if register.qubit_state(0) != expected:
+                mismatches.append((gate, state, register.qubit_state(0), expected))
+        for master in (0, 1, 2, 3):
+            register = QubitRegister.from_states([master, state])
+            register.cnot(0, 1)
+            expected = gate_on_state(state, "C", master)
+            if register.qubit_state(1) != expected:
+                mismatches.append(("C", state, master, register.qubit_state(1), expected))
+    return mismatches
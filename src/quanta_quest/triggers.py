@@ -0,0 +1,123 @@
+"""Zone triggers for Quanta Quest.
+
+The map is divided into zones, which are x intervals [left, right). Each
+zone holds callbacks for the player entering it, leaving it and staying
+inside it. Callbacks can also watch a ball for state changes. A callback
+returns True once it has fired, which unregisters it; a zone with no
+callbacks left is dropped. Each frame costs one bisect on the player's x
+position, and callbacks only run on a transition or inside their own zone.
+"""
+
+import bisect
+import math
+
+
+class Zone:
+    """An x interval [left, right) of the map and its callbacks."""
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.on_enter = []
+        self.on_exit = []
+        self.while_inside = []
+
+    def is_empty(self):
+        return not (self.on_enter or self.on_exit or self.while_inside)
+
+
+class TriggerMap:
+    """Zones and state watchers, checked against the player's position."""
+
+    def __init__(self):
+        self.zones = []
+        self._watchers = {}
+        self._bounds = None
+        self._segments = None
+        self._segment = None
+        self._inside = ()
+
+    def add_zone(self, left, right=math.inf):
+        """Add and return an empty zone; attach callbacks to its lists."""
+        zone = Zone(left, right)
+        self.zones.append(zone)
+        self._bounds = None
+        return zone
+
+    def watch(self, ball, callback):
+        """Call callback(ball) whenever state_changed(ball) is reported."""
+        self._watchers.setdefault(ball, []).append(callback)
+
+    def inside(self, zone):
+        """Return whether the player was inside zone at the last update."""
+        return zone in self._inside
+
+    def _build(self):
+        # Split the map at every zone edge; segment i is
+        # [bounds[i - 1], bounds[i]) and lists the zones covering it.
+        self._bounds = sorted({edge for zone in self.zones for edge in (zone.left, zone.right)})
+        self._segments = [()]
+        for left in self._bounds:
+            self._segments.append(
+                tuple(zone for zone in self.zones if zone.left <= left < zone.right)
+            )
+        self._segment = None
+
+    def update(self, x):
+        """Fire the callbacks due for the player now being at x."""
+        if self._bounds is None:
+            self._build()
+        segment = bisect.bisect_right(self._bounds, x)
+        if segment != self._segment:
+            inside = self._segments[segment]
+            for zone in self._inside:
+                if zone not in inside:
+                    self._fire(zone, zone.on_exit)
+            for zone in inside:
+                if zone not in self._inside:
+                    self._fire(zone, zone.on_enter)
+            self._inside = inside
+            self._segment = segment
+        for zone in self._inside:
+            if zone.while_inside:
+                self._fire(zone, zone.while_inside)
+
+    def state_changed(self, ball):
+        """Run the callbacks watching ball."""
+        callbacks = self._watchers.get(ball)
+        if callbacks:
+            for callback in list(callbacks):
+                if callback(ball):
+                    callbacks.remove(callback)
+            if not callbacks:
+                del self._watchers[ball]
+
+    def _fire(self, zone, callbacks):
+        for callback in list(callbacks):
+            if callback():
+                callbacks.remove(callback)
+        if zone.is_empty() and zone in self.zones:
+            self.zones.remove(zone)
+            self._bounds = None
+
+    def snapshot(self):
+        """Return the zones, watchers and callbacks still registered, for restore."""
+        zones = [
+            (zone, list(zone.on_enter), list(zone.on_exit), list(zone.while_inside))
+            for zone in self.zones
+        ]
+        watchers = {ball: list(callbacks) for ball, callbacks in self._watchers.items()}
+        return zones, watchers, self._inside
+
+    def restore(self, snapshot):
+        """Go back to the registrations saved by snapshot."""
+        zones, watchers, inside = snapshot
+        self.zones = []
+        for zone, on_enter, on_exit, while_inside in zones:
+            zone.on_enter[:] = on_enter
+            zone.on_exit[:] = on_exit
+            zone.while_inside[:] = while_inside
+            self.zones.append(zone)
+        self._watchers = {ball: list(callbacks) for ball, callbacks in watchers.items()}
+        self._inside = inside
+        self._bounds = None
@@ -1,36 +1,37 @@
 """Game views for Quanta Quest."""
 
-import random
+import time
 
 import arcade
 import arcade.gui
 from arcade.camera import Camera2D
 
 from quanta_quest.assets import asset_path
+from quanta_quest.chunks import ChunkedScene
 from quanta_quest.constants import (
-    BALL_SCALING,
     BGCOLOR,
-    GATE_INTERVAL,
-    GATE_NUMBER,
-    GRAVITY,
     GRID_PIXEL_SIZE,
-    MAP_WIDTH,
-    PAIR_DISTANCE,
-    PLAYER_JUMP_SPEED,
-    PLAYER_MOVEMENT_SPEED,
-    PLAYER_START_X,
-    PLAYER_START_Y,
     SCORE_X,
     SCORE_Y,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
-    STATE_INTERVAL,
-    STATE_NUMBER,
     TEXT_WIDTH,
-    TILE_SCALING,
+    TICK_SECONDS,
 )
-from quanta_quest.gate_manipulator import gate_on_state
-from quanta_quest.sprites import PlayerCharacter, QuantumBall, QuantumGate
+from quanta_quest.engine import CHOICE, GAME_OVER, MESSAGE, SOUND, GameEngine
+from quanta_quest.preload import Preloader, load_background
+from quanta_quest.profiler import PROFILER, ProfilerOverlay
+from quanta_quest.replay import InputRecorder
+from quanta_quest.scheduler import FixedTimestep
+from quanta_quest.sounds import SOUNDS
+from quanta_quest.sprites import GAME_TEXTURES, TEXTURES, texture_scale
+
+
+def draw_background(background):
+    """Draw a background over the screen once it has been decoded."""
+    texture = background.texture
+    if texture is not None:
+        arcade.draw_texture_rect(texture, arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT))
 
 
 class Messagebox(arcade.gui.UIMessageBox):
@@ -41,20 +42,22 @@ class Messagebox(arcade.gui.UIMessageBox):
                          message_text=message,
                          buttons=["Okay"])
         self.game = game
-        self.game.can_move = False
         self.game.is_message = self
 
     def on_action(self, event):
-        self.game.can_move = True
+        self.game.engine.dismiss_message()
         self.game.is_message = None
 
 
 class GameView(arcade.View):
     """
     Main application class.
+
+    The game rules run in a GameEngine; this view draws its scene and turns
+    its events into message boxes, sounds and view changes.
     """
 
-    def __init__(self):
+    def __init__(self, engine=None):
 
         # Call the parent class and set up the window
         super().__init__()
@@ -64,311 +67,172 @@ class GameView(arcade.View):
 
         self.is_message = None
 
-        # Our Scene Object
-        self.scene = None
+        # Level, player, physics and puzzle state, built here unless a
+        # Preloader has prepared it already
+        self.engine = engine if engine is not None else GameEngine()
+        self.scene = self.engine.scene
+        self.player_sprite = self.engine.player_sprite
+        # Every input is logged so F5 can save the session for replay
+        self.recorder = InputRecorder.attach(self.engine)
 
-        # Separate variable that holds the player sprite
-        self.player_sprite = None
-        self.can_shoot = True
-        self.shoot_timer = 0
+        # Balls whose state changed since they were last re-textured
+        self.dirty_balls = set()
+        self.engine.balls.dirty_set = self.dirty_balls
 
-        # Our physics engine
-        self.physics_engine = None
-
-        # A Camera that can be used for scrolling the screen
-        self.camera = None
+        # A Camera that can be used for scrolling the screen, and the scene
+        # split into chunks so that only those in its view are drawn
+        self.camera = Camera2D()
+        self.chunks = ChunkedScene(self.scene)
 
         # A Camera that can be used to draw GUI elements
-        self.gui_camera = None
-
-        self.show_instruction = [True] * 10
-
-        # Keep track of the score
-
-        self.left_pressed = False
-        self.right_pressed = False
-        self.up_pressed = False
-        self.down_pressed = False
-        self.jump_needs_reset = False
-        self.shoot_pressed = False
-        self.can_move = True
-
-        # Load sounds
-        self.collect_coin_sound = arcade.load_sound(":resources:sounds/coin1.wav")
-        self.jump_sound = arcade.load_sound(":resources:sounds/jump1.wav")
-        self.game_over = arcade.load_sound(":resources:sounds/gameover1.wav")
-        self.shoot_sound = arcade.load_sound(":resources:sounds/hurt5.wav")
-        self.hit_sound = arcade.load_sound(":resources:sounds/hit5.wav")
-        self.hurt_sound = arcade.load_sound(":resources:sounds/explosion2.wav")
-
-        self.background = None
-        self.collected_gates = {"X": 0, "Z": 0, "H": 0, "C": 0}
-        self.score_images = {
-            "X": arcade.load_texture(asset_path("score_X.png")),
-            "Z": arcade.load_texture(asset_path("score_Z.png")),
-            "H": arcade.load_texture(asset_path("score_H.png")),
-            "C": arcade.load_texture(asset_path("score_C.png")),
-        }
-
-        self.scene = arcade.Scene()
-
-        # Set up the Game Camera
-        self.camera = Camera2D()
+        self.gui_camera = Camera2D()
+        self.profiler_overlay = ProfilerOverlay(PROFILER, SCREEN_WIDTH - 440, SCREEN_HEIGHT - 10)
 
-        self.background = arcade.load_texture(asset_path("main.png"))
+        self.score_images = {}
+        self.score_scales = {}
+        for g in self.engine.collected_gates:
+            path = asset_path(f"score_{g}.png")
+            self.score_images[g] = TEXTURES.get(path, owner=GAME_TEXTURES)
+            # Half the PNG's size, whatever size an atlas rasterized it at
+            self.score_scales[g] = 0.5 / texture_scale(path)
 
-        # Set up the GUI Camera
-        self.gui_camera = Camera2D()
+        self.background = load_background(self.window, "main.png", GAME_TEXTURES)
 
-        # Set up the player, specifically placing it at these coordinates.
-        self.player_sprite = PlayerCharacter()
-        self.player_sprite.center_x = PLAYER_START_X
-        self.player_sprite.center_y = PLAYER_START_Y
-        self.scene.add_sprite("Player", self.player_sprite)
-
-        for x in range(0, int((MAP_WIDTH + 1) * GRID_PIXEL_SIZE), GRID_PIXEL_SIZE):
-            wall = arcade.Sprite(":resources:images/tiles/grassMid.png", TILE_SCALING)
-            wall.center_x = x
-            wall.center_y = 32
-            self.scene.add_sprite("Walls", wall)
-        wall = arcade.Sprite(":resources:images/tiles/dirtHalf_mid.png", TILE_SCALING)
-        wall.center_x = (0.3 + STATE_NUMBER + 1) * STATE_INTERVAL * GRID_PIXEL_SIZE
-        wall.center_y = PLAYER_START_Y + 20 + PAIR_DISTANCE // 2
-        self.scene.add_sprite("Walls", wall)
-
-        for x in range(STATE_NUMBER):
-            state = QuantumBall(2 * (1 - x % 2))
-            state.center_x = (0.5 + x) * STATE_INTERVAL * GRID_PIXEL_SIZE
-            state.center_y = PLAYER_START_Y + 30
-            self.scene.add_sprite("States", state)
-            state.message_index = x
-        self.init_ball = self.scene["States"][0]
-
-        for x in range(2):
-            state1 = QuantumBall(2 * (1 - x))
-            state2 = QuantumBall(x * 2)
-            state1.scale = 1.2 * BALL_SCALING
-            state2.master = state1
-            state2.message_index = STATE_NUMBER + x
-            state1.center_x = (0.5 + STATE_NUMBER + x) * STATE_INTERVAL * GRID_PIXEL_SIZE
-            state2.center_x = (0.5 + STATE_NUMBER + x) * STATE_INTERVAL * GRID_PIXEL_SIZE
-            state1.center_y = PLAYER_START_Y + 30 + PAIR_DISTANCE
-            state2.center_y = PLAYER_START_Y + 30
-            self.scene.add_sprite("States", state1)
-            self.scene.add_sprite("States", state2)
-
-        state_C = QuantumBall(0)
-        state_A = QuantumBall(4)
-        state_B = QuantumBall(4)
-
-        state_C.message_index = STATE_NUMBER + 2
-
-        state_C.center_x = (0.5 + STATE_NUMBER + 2) * STATE_INTERVAL * GRID_PIXEL_SIZE
-        state_A.center_x = (0.5 + STATE_NUMBER + 2) * STATE_INTERVAL * GRID_PIXEL_SIZE
-        state_B.center_x = (0.5 + STATE_NUMBER + 2) * STATE_INTERVAL * GRID_PIXEL_SIZE
-
-        state_C.center_y = PLAYER_START_Y + 30
-        state_A.center_y = PLAYER_START_Y + 250
-        state_B.center_y = 0.8 * SCREEN_HEIGHT
-
-        self.scene.add_sprite("States", state_C)
-        self.scene.add_sprite("States", state_A)
-        self.scene.add_sprite("States", state_B)
-
-        wall = arcade.Sprite(":resources:images/tiles/dirtHalf_mid.png", TILE_SCALING)
-        wall.center_x = state_A.center_x - 120
-        wall.center_y = state_A.center_y - 120
-        self.scene.add_sprite("Walls", wall)
-        self.end_timer = 0
-
-        state1 = QuantumBall(0)
-        state2 = QuantumBall(4)
-        state2.message_index = STATE_NUMBER + 3
-        state1.message_index = STATE_NUMBER + 3
-        state1.center_x = (0.5 + STATE_NUMBER + 3) * STATE_INTERVAL * GRID_PIXEL_SIZE
-        state2.center_x = (0.5 + STATE_NUMBER + 3) * STATE_INTERVAL * GRID_PIXEL_SIZE
-        state1.center_y = PLAYER_START_Y + 30 + PAIR_DISTANCE
-        state2.center_y = PLAYER_START_Y + 30
-        self.scene.add_sprite("States", state1)
-        self.scene.add_sprite("States", state2)
-        wall = arcade.Sprite(":resources:images/tiles/dirtHalf_mid.png", TILE_SCALING)
-        wall.center_x = state1.center_x - 120
-        wall.center_y = state1.center_y - 120
-        self.scene.add_sprite("Walls", wall)
-
-        for x in range(1, GATE_NUMBER + 1):
-            gate = QuantumGate(["X", "Z", "H", "C"][x - 1])
-            gate.center_x = x * STATE_INTERVAL * GRID_PIXEL_SIZE
-            gate.center_y = PLAYER_START_Y + 32
-            self.scene.add_sprite("Gates", gate)
-
-        self.scene.add_sprite_list("Items")
-
-        self.physics_engine = arcade.PhysicsEnginePlatformer(
-            self.player_sprite, gravity_constant=GRAVITY, walls=self.scene["Walls"]
-        )
-        self.show_instruction_challenges = [True] * 4
-        self.end_of_map = MAP_WIDTH * GRID_PIXEL_SIZE
-        self.time = 0
+        # Fixed-rate simulation, and where the player was before the last tick
+        self.timestep = FixedTimestep()
+        self.previous_position = self.player_sprite.position
+        # Whether frames are being skipped to let the simulation catch up
+        self.skipping_draws = False
 
-        self.end_of_map_sprite = arcade.Sprite(
-            ":resources:images/tiles/signExit.png", TILE_SCALING
-        )
-        self.end_of_map_sprite.center_x = self.end_of_map
-        self.end_of_map_sprite.center_y = PLAYER_START_Y
-        self.scene.add_sprite("Items", self.end_of_map_sprite)
+        # One icon per collected gate, rebuilt when the counts change
+        self.hud = arcade.SpriteList()
+        self.hud_counts = None
 
     def on_draw(self):
         """Render the screen."""
+        with PROFILER.section("draw"):
+            self._draw()
 
+    def _draw(self):
         self.clear()
 
-        arcade.draw_texture_rect(
-            self.background,
-            arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT),
-        )
+        draw_background(self.background)
 
+        # Draw the player where it would be between the last two ticks
+        position = self.player_sprite.position
+        self.player_sprite.position = self.interpolated_position()
+        self.center_camera_to_player()
         self.camera.use()
+        self.chunks.set_view_from_camera(self.camera)
+        self.update_balls()
 
         # Draw our Scene
-        self.scene.draw()
+        with PROFILER.section("scene.draw"):
+            self.chunks.draw()
+        self.player_sprite.position = position
+        PROFILER.count("chunks drawn", self.chunks.drawn_chunks)
+        PROFILER.count("chunks culled", self.chunks.culled_chunks)
+        PROFILER.count("sprites drawn", self.chunks.drawn_sprites)
+        PROFILER.count("sprites culled", self.chunks.culled_sprites)
 
         # Activate the GUI camera before drawing GUI elements
         self.gui_camera.use()
 
-        # Draw our score on the screen, scrolling it with the viewport
-        for j, (g, v) in enumerate(self.collected_gates.items()):
+        # Draw the collected gates, fixed to the screen
+        self.update_hud()
+        self.hud.draw()
+
+        with PROFILER.section("manager.draw"):
+            self.manager.draw()
+
+        self.profiler_overlay.draw()
+
+    def update_balls(self):
+        """Re-texture the changed balls in view; the rest wait until they come into view."""
+        in_view = [ball for ball in self.dirty_balls if self.chunks.in_view(ball)]
+        for ball in in_view:
+            ball.update_animation()
+            self.dirty_balls.discard(ball)
+
+    def update_hud(self):
+        """Rebuild the gate icons if collected_gates changed since the last call."""
+        counts = tuple(self.engine.collected_gates.items())
+        if counts == self.hud_counts:
+            return
+        self.hud_counts = counts
+        self.hud.clear()
+        for j, (g, v) in enumerate(counts):
             image = self.score_images[g]
+            scale = self.score_scales[g]
             for i in range(v):
-                cx = (1.5 * j + 1) * SCORE_X
-                cy = SCORE_Y - 100 * i
-                hw = image.width // 4
-                hh = image.height // 4
-                arcade.draw_texture_rect(
-                    image,
-                    arcade.LRBT(cx - hw, cx + hw, cy - hh, cy + hh),
+                self.hud.append(
+                    arcade.Sprite(image, scale, (1.5 * j + 1) * SCORE_X, SCORE_Y - 100 * i)
+                )
+
+    def process_events(self):
+        """Present the events the engine queued since the last call."""
+        for kind, value in self.engine.pop_events():
+            if kind == MESSAGE:
+                self.manager.add(Messagebox(value, self))
+            elif kind == CHOICE:
+                message_text, buttons = value
+                message_box = arcade.gui.UIMessageBox(
+                    width=400,
+                    height=250,
+                    message_text=message_text,
+                    buttons=buttons,
                 )
 
-        self.manager.draw()
+                @message_box.event("on_action")
+                def on_action(event):
+                    self.engine.answer_teleport(event.action)
+                    self.process_events()
 
-    def process_keychange(self):
-        """
-        Called when we change a key up/down or we move on/off a ladder.
-        """
-        # Process up/down
-        if self.up_pressed and not self.down_pressed:
-            if (
-                self.physics_engine.can_jump(y_distance=10)
-                and not self.jump_needs_reset
-            ):
-                self.player_sprite.change_y = PLAYER_JUMP_SPEED
-                self.jump_needs_reset = True
-                arcade.play_sound(self.jump_sound)
-
-        # Process left/right
-        if self.right_pressed and not self.left_pressed:
-            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
-        elif self.left_pressed and not self.right_pressed:
-            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
-        else:
-            self.player_sprite.change_x = 0
+                self.manager.add(message_box)
+            elif kind == SOUND:
+                SOUNDS.play(value)
+            elif kind == GAME_OVER:
+                game_over_view = GameOverView()
+                self.window.show_view(game_over_view)
 
     def on_key_press(self, key, modifiers):
         """Called whenever a key is pressed."""
 
-        if key == arcade.key.UP or key == arcade.key.W:
-            self.up_pressed = True
-        elif key == arcade.key.DOWN or key == arcade.key.S:
-            self.down_pressed = True
-        elif key == arcade.key.LEFT or key == arcade.key.A:
-            self.left_pressed = True
-        elif key == arcade.key.RIGHT or key == arcade.key.D:
-            self.right_pressed = True
-        elif key == arcade.key.ESCAPE:
+        if key == arcade.key.ESCAPE:
             pause_view = PauseMenu(self)
             self.window.show_view(pause_view)
+        elif key == arcade.key.F3:
+            PROFILER.toggle()
+        elif key == arcade.key.F4:
+            stem = time.strftime("quanta_profile_%Y%m%d_%H%M%S")
+            PROFILER.export(f"{stem}.csv")
+            PROFILER.export(f"{stem}.json")
+        elif key == arcade.key.F5:
+            self.recorder.save(time.strftime("quanta_input_%Y%m%d_%H%M%S.qqin"))
         elif key == arcade.key.ENTER and self.is_message is not None:
             self.manager.remove(self.is_message)
-            self.can_move = True
+            self.engine.dismiss_message()
             self.is_message = None
 
-        self.process_keychange()
+        self.engine.key_press(key, modifiers)
+        self.process_events()
 
     def on_key_release(self, key, modifiers):
         """Called when the user releases a key."""
-
-        if key == arcade.key.UP or key == arcade.key.W:
-            self.up_pressed = False
-            self.jump_needs_reset = False
-        elif key == arcade.key.DOWN or key == arcade.key.S:
-            self.down_pressed = False
-        elif key == arcade.key.LEFT or key == arcade.key.A:
-            self.left_pressed = False
-        elif key == arcade.key.RIGHT or key == arcade.key.D:
-            self.right_pressed = False
-
-        for hit_state in arcade.check_for_collision_with_list(self.player_sprite, self.scene["States"]):
-            if key == arcade.key.X and (modifiers & arcade.key.MOD_ALT) and self.collected_gates['X'] > 0:
-                hit_state.state = gate_on_state(hit_state.state, 'X')
-                self.collected_gates['X'] -= 1
-                arcade.play_sound(self.shoot_sound)
-            if key == arcade.key.Z and (modifiers & arcade.key.MOD_ALT) and self.collected_gates['Z'] > 0:
-                hit_state.state = gate_on_state(hit_state.state, 'Z')
-                self.collected_gates['Z'] -= 1
-                arcade.play_sound(self.shoot_sound)
-            if key == arcade.key.H and (modifiers & arcade.key.MOD_ALT) and self.collected_gates['H'] > 0:
-                hit_state.state = gate_on_state(hit_state.state, 'H')
-                self.collected_gates['H'] -= 1
-                arcade.play_sound(self.shoot_sound)
-            if (key == arcade.key.C and (modifiers & arcade.key.MOD_ALT)
-                and hit_state.master is not None and self.collected_gates['C'] > 0
-                ):
-                hit_state.state = gate_on_state(hit_state.state, 'C', hit_state.master.state)
-                self.collected_gates['C'] -= 1
-                arcade.play_sound(self.shoot_sound)
-            if (self.scene["States"].index(hit_state) == STATE_NUMBER + 4
-                and self.show_instruction_challenges[1] is False
-                and key == arcade.key.M and (modifiers & arcade.key.MOD_ALT)
-                ):
-                    self.scene["States"][STATE_NUMBER + 4].state = 4
-                    self.scene["States"][STATE_NUMBER + 5].state = 4
-                    self.scene["States"][STATE_NUMBER + 6].state = 2 * random.randint(0, 1)
-                    message_box = arcade.gui.UIMessageBox(
-                        width=400,
-                        height=250,
-                        message_text=(
-                            "Note that the upper ball has now become non-entangled. Complete the teleportation by figuring out the correct gate (X/Z/H) that will convert the upper ball into the black ball we wanted to teleport. Answer by clicking one of the buttons."
-                        ),
-                        buttons=["X gate", "Z gate", "H gate"]
-                    )
-
-                    @message_box.event("on_action")
-                    def on_action(event):
-                        self.on_final_message_close(event.action)
-
-                    self.manager.add(message_box)
-            if ((self.scene["States"].index(hit_state) == STATE_NUMBER + 7
-                 or self.scene["States"].index(hit_state) == STATE_NUMBER + 8)
-                and key in (arcade.key.X, arcade.key.Z, arcade.key.H, arcade.key.C)
-                ):
-                if self.scene["States"][STATE_NUMBER + 7].state == self.scene["States"][STATE_NUMBER + 8].state:
-                    messagebox = Messagebox("Great! You have finished the game.", self)
-                    self.manager.add(messagebox)
-                else:
-                    messagebox = Messagebox("Oops! That did't work. Try again?", self)
-                    self.manager.add(messagebox)
-
-        self.process_keychange()
-
-    def on_final_message_close(self, button_text):
-        self.scene["States"][STATE_NUMBER + 6].state = gate_on_state(self.scene["States"][STATE_NUMBER + 6].state, button_text[0])
-        if self.scene["States"][STATE_NUMBER + 6].state in [2, 3]:
-            messagebox = Messagebox("Nicely done! You have successfully teleported the ball. Proceed to complete the game.", self)
-            self.manager.add(messagebox)
-        else:
-            messagebox = Messagebox("Sadly, that wasn't the correct answer. You will have to start from the beginning.", self)
-            self.manager.add(messagebox)
-            self.end_timer = 1
+        self.engine.key_release(key, modifiers)
+        self.process_events()
+
+    def interpolated_position(self):
+        """Return the player's position blended between the last two ticks."""
+        (x0, y0), (x1, y1) = self.previous_position, self.player_sprite.position
+        if self.timestep.behind:
+            # Frames are far apart; blending would only lag the player
+            return x1, y1
+        if abs(x1 - x0) > GRID_PIXEL_SIZE or abs(y1 - y0) > GRID_PIXEL_SIZE:
+            # Respawned after a fall; don't slide across the map
+            return x1, y1
+        alpha = self.timestep.alpha
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
 
     def center_camera_to_player(self):
         screen_center_x = self.player_sprite.center_x - (self.camera.viewport_width / 2)
@@ -386,115 +250,38 @@ class GameView(arcade.View):
         )
 
     def on_update(self, delta_time):
-
-        self.time += 1
-        if self.time == 100:
-            self.init_ball.state = (self.init_ball.state + 1) % 8
-            self.time = 0
-        for state in self.scene["States"]:
-            state.update_animation()
-
-        # Move the player with the physics engine
-        if self.can_move:
-            self.physics_engine.update()
-
-        if self.player_sprite.center_x > PLAYER_START_X and self.show_instruction[0]:
-            messagebox = Messagebox("Our explorer suddenly finds herself in the quantum world. In this world, information is stored in the colour and orientation of balls.", self)
-            self.manager.add(messagebox)
-
-            self.left_pressed, self.right_pressed, self.up_pressed, self.down_pressed, self.jump_needs_reset, self.shoot_pressed = [False] * 6
-            self.show_instruction[0] = False
-
-        if self.physics_engine.can_jump():
-            self.player_sprite.can_jump = False
-        else:
-            self.player_sprite.can_jump = True
-
-        self.process_keychange()
-
-        self.scene.update_animation(
-            delta_time, ["Player"]
-        )
-
-        self.center_camera_to_player()
-
-        if self.end_timer > 0:
-            self.end_timer += 1
-            if self.end_timer == 200:
-                game_over_view = GameOverView()
-                self.window.show_view(game_over_view)
-
-        if self.player_sprite.center_y < -100:
-            self.player_sprite.center_x = PLAYER_START_X
-            self.player_sprite.center_y = PLAYER_START_Y
-
-            arcade.play_sound(self.game_over)
-
-        if self.scene["States"][STATE_NUMBER + 4].state == 2 and self.show_instruction_challenges[1] is True:
-            messagebox = Messagebox("Great. The next step is to perform a \"Bell measurement\" on the pair of lower balls, by pressing ALT+M on the lowest ball. This will transfer the entanglement to the lower balls.", self)
-            self.manager.add(messagebox)
-            self.show_instruction_challenges[1] = False
-
-        if (self.player_sprite.center_x >= (1.5 + STATE_NUMBER) * STATE_INTERVAL * GRID_PIXEL_SIZE
-            + self.scene["States"][STATE_NUMBER + 3].width):
-            if self.scene["States"][STATE_NUMBER + 2].state == 4 and self.scene["States"][STATE_NUMBER + 3].state == 4 and self.show_instruction_challenges[0]:
-                messagebox = Messagebox("Well done! You can see the entanglement in the fact that the colours of the two halves are correlated: white is above white and black is above black. Have another hadamard!", self)
-                self.collected_gates['H'] += 1
-                self.show_instruction_challenges[0] = False
-                self.show_instruction_challenges[3] = False
-                self.show_instruction_challenges[2] = False
-                self.manager.add(messagebox)
-            elif self.scene["States"][STATE_NUMBER + 2].state == 2 and self.scene["States"][STATE_NUMBER + 3].state == 0 and self.show_instruction_challenges[2]:
-                messagebox = Messagebox("It seems like you skipped it. It would be useful if you learnt this before proceeding.", self)
-                self.show_instruction_challenges[2] = False
-                self.manager.add(messagebox)
-            elif self.show_instruction_challenges[3]:
-                messagebox = Messagebox("I don't think you applied the correct operations. Want to try again before proceeding?", self)
-                self.show_instruction_challenges[3] = False
-                self.manager.add(messagebox)
-
-        if self.player_sprite.center_x >= self.end_of_map:
-            game_over_view = GameOverView()
-            self.window.show_view(game_over_view)
-
-        state_hit_list = arcade.check_for_collision_with_list(
-            self.player_sprite, self.scene["States"]
-        )
-        for state in state_hit_list:
-            if state.message_index is not None:
-                message = [
-                    "The balls can be black or white or some combination of them. The balls can be upright or upside down. The balls can be modified by applying gates on them.",
-                    "Press Alt + X to apply the X gate on this state. You will find that it flips the colour.",
-                    "Press Alt + Z to apply the Z gate. You will find that it rotates the black ball but keeps the white ball unchanged.",
-                    "Press Alt + H to apply the Hadamard gate. You will find that it creates a mixture of both colours.",
-                    "Information can also be stored in pair of balls. The upper one acts as the master ball. Press Alt + C to apply the CNOT gate on the lower ball. It changes the colour of the lower ball if the master ball is black, otherwise leaves the lower ball unchanged.",
-                    "The next step is to create an \"entangled\" pair of balls. This is done by first applying an H gate on the master ball, and then applying a CNOT gate on the lower ball. Try it!",
-                    "The final step is to teleport a black ball to the top of the screen. For this, we have provided you an entangled pair (the two upper balls). First, flip the colour of the lowest ball by applying the appropriate gate.",
-                    "Care to complete a challenge before finishing the game? Apply a single gate on any one of the balls to make them identical.",
-                ][state.message_index]
-
-                if self.show_instruction[state.message_index + 1]:
-                    messagebox = Messagebox(message, self)
-                    self.manager.add(messagebox)
-                    self.show_instruction[state.message_index + 1] = False
-
-        gate_hit_list = arcade.check_for_collision_with_list(
-            self.player_sprite, self.scene["Gates"]
-        )
-
-        for gate in gate_hit_list:
-            message = [
-                "You have collected two X gates. You will learn how to use it very soon. You will need these gates later, so keep them handy.",
-                "You have collected two Z gates. You will learn how to use it very soon.",
-                "You have collected two Hadamard gates. You will learn how to use it very soon.",
-                "You have collected two CNOT gates, which, unlike the other gates, only act on pairs of balls. You will learn how to use it very soon.",
-            ][GATE_NUMBER - len(self.scene["Gates"])]
-
-            messagebox = Messagebox(message, self)
-            self.manager.add(messagebox)
-            self.collected_gates[gate.name] += 2
-            arcade.play_sound(self.collect_coin_sound)
-            gate.remove_from_sprite_lists()
+        PROFILER.next_frame()
+        with PROFILER.section("update"):
+            self._update(delta_time)
+
+    def _update(self, delta_time):
+        # Run as many fixed ticks as the frame time covers
+        for _ in range(self.timestep.advance(delta_time)):
+            self.previous_position = self.player_sprite.position
+            self.engine.update()
+            self.scene.update_animation(TICK_SECONDS, ["Player"])
+
+        self.process_events()
+        self.adjust_draw_rate(delta_time)
+
+    def on_hide_view(self):
+        # Other views draw every frame
+        if self.skipping_draws:
+            self.window.set_draw_rate(TICK_SECONDS)
+            self.skipping_draws = False
+
+    def adjust_draw_rate(self, delta_time):
+        """Draw only every other frame while the simulation is behind.
+
+        arcade draws once the frame times since the last draw add up to the
+        draw rate, so a rate just under two frames skips every other draw
+        and buffer flip, and that time goes to ticks instead.
+        """
+        if self.timestep.behind:
+            self.window.set_draw_rate(1.9 * delta_time)
+        elif self.skipping_draws:
+            self.window.set_draw_rate(TICK_SECONDS)
+        self.skipping_draws = self.timestep.behind
 
 
 class PauseMenu(arcade.View):
@@ -502,20 +289,8 @@ class PauseMenu(arcade.View):
     def __init__(self, prev_view):
         super().__init__()
         self.prev_view = prev_view
-
-    def on_show_view(self):
-        """Called when switching to this view."""
-        arcade.set_background_color(BGCOLOR)
-
-    def on_draw(self):
-        """Draw the menu"""
-        self.clear()
-        image = arcade.load_texture(asset_path("opening_cropped.png"))
-        arcade.draw_texture_rect(
-            image,
-            arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT),
-        )
-        arcade.draw_text(
+        self.background = load_background(self.window, "opening_cropped.png", self)
+        self.text = arcade.Text(
             "Press enter or click to resume the game.\n\nPress Escape to restart the game.\n\nPress Q to quit.",
             200,
             SCREEN_HEIGHT // 1.5,
@@ -529,6 +304,21 @@ class PauseMenu(arcade.View):
             align='left',
         )
 
+    def on_show_view(self):
+        """Called when switching to this view."""
+        arcade.set_background_color(BGCOLOR)
+
+    def on_hide_view(self):
+        # Only this view holds its background; let the registry evict it
+        self.background.wait()
+        TEXTURES.release(self)
+
+    def on_draw(self):
+        """Draw the menu"""
+        self.clear()
+        draw_background(self.background)
+        self.text.draw()
+
     def on_mouse_press(self, x, y, button, modifiers):
         self.window.show_view(self.prev_view)
 
@@ -545,65 +335,79 @@ class PauseMenu(arcade.View):
 class MainMenu(arcade.View):
     """Class that manages the 'menu' view."""
 
+    def __init__(self):
+        super().__init__()
+        self.background = load_background(self.window, "opening_cropped.png", self)
+        self.preloader = Preloader(self.window)
+        self.texts = [
+            arcade.Text(
+                "QUANTA QUEST",
+                200,
+                SCREEN_HEIGHT - 200,
+                arcade.color.BLACK,
+                font_size=70,
+                anchor_x="left",
+                anchor_y="top",
+                bold=True,
+                multiline=True,
+                width=900,
+                align='left',
+            ),
+            arcade.Text(
+                "THE JOURNEY OF A QUANTUM EXPLORER",
+                200,
+                SCREEN_HEIGHT - 350,
+                arcade.color.BLACK,
+                font_size=40,
+                anchor_x="left",
+                anchor_y="top",
+                bold=True,
+                multiline=True,
+                width=1200,
+                align='left',
+            ),
+            arcade.Text(
+                "Click or press Enter to start playing.\nMove and jump using arrow keys or W/A/S/D.\nWhile playing, press Escape to exit or restart the game.",
+                200,
+                SCREEN_HEIGHT // 2,
+                arcade.color.BLACK,
+                font_size=35,
+                anchor_x="left",
+                anchor_y="top",
+                bold=False,
+                multiline=True,
+                width=1000,
+                align='left',
+            ),
+        ]
+
     def on_show_view(self):
         """Called when switching to this view."""
         arcade.set_background_color(BGCOLOR)
 
+    def on_hide_view(self):
+        # Only this view holds its background; let the registry evict it
+        self.background.wait()
+        TEXTURES.release(self)
+
     def on_draw(self):
         """Draw the menu"""
         self.clear()
-        image = arcade.load_texture(asset_path("opening_cropped.png"))
-        arcade.draw_texture_rect(
-            image,
-            arcade.LRBT(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT),
-        )
-        arcade.draw_text(
-            "QUANTA QUEST",
-            200,
-            SCREEN_HEIGHT - 200,
-            arcade.color.BLACK,
-            font_size=70,
-            anchor_x="left",
-            anchor_y="top",
-            bold=True,
-            multiline=True,
-            width=900,
-            align='left',
-        )
-        arcade.draw_text(
-            "THE JOURNEY OF A QUANTUM EXPLORER",
-            200,
-            SCREEN_HEIGHT - 350,
-            arcade.color.BLACK,
-            font_size=40,
-            anchor_x="left",
-            anchor_y="top",
-            bold=True,
-            multiline=True,
-            width=1200,
-            align='left',
-        )
-        arcade.draw_text(
-            "Click or press Enter to start playing.\nMove and jump using arrow keys or W/A/S/D.\nWhile playing, press Escape to exit or restart the game.",
-            200,
-            SCREEN_HEIGHT // 2,
-            arcade.color.BLACK,
-            font_size=35,
-            anchor_x="left",
-            anchor_y="top",
-            bold=False,
-            multiline=True,
-            width=1000,
-            align='left',
-        )
+        draw_background(self.background)
+        for text in self.texts:
+            text.draw()
+
+    def on_update(self, delta_time):
+        # Get the game ready while the player reads the menu
+        self.preloader.update()
 
     def on_mouse_press(self, x, y, button, modifiers):
-        game_view = GameView()
+        game_view = GameView(self.preloader.take())
         self.window.show_view(game_view)
 
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ENTER:
-            game_view = GameView()
+            game_view = GameView(self.preloader.take())
             self.window.show_view(game_view)
         elif key == arcade.key.ESCAPE:
             arcade.exit()
@@ -612,14 +416,9 @@ class MainMenu(arcade.View):
 class GameOverView(arcade.View):
     """Class to manage the game overview"""
 
-    def on_show_view(self):
-        """Called when switching to this view"""
-        arcade.set_background_color(arcade.color.BLACK)
-
-    def on_draw(self):
-        """Draw the game overview"""
-        self.clear()
-        arcade.draw_text(
+    def __init__(self):
+        super().__init__()
+        self.text = arcade.Text(
             "Game Over - Click to restart",
             SCREEN_WIDTH / 2,
             SCREEN_HEIGHT / 2,
@@ -628,7 +427,22 @@ class GameOverView(arcade.View):
             anchor_x="center",
         )
 
+    def on_show_view(self):
+        """Called when switching to this view"""
+        arcade.set_background_color(arcade.color.BLACK)
+        # The game's textures stay in the registry, so the preloader only
+        # has to build a new engine
+        self.preloader = Preloader(self.window)
+
+    def on_update(self, delta_time):
+        self.preloader.update()
+
+    def on_draw(self):
+        """Draw the game overview"""
+        self.clear()
+        self.text.draw()
+
     def on_mouse_press(self, _x, _y, _button, _modifiers):
         """Use a mouse press to advance to the 'game' view."""
-        game_view = GameView()
+        game_view = GameView(self.preloader.take())
         self.window.show_view(game_view)
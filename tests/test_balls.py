@@ -0,0 +1,85 @@
+import numpy as np
+
+from quanta_quest.balls import ENTANGLED_STATE, BallStore
+from quanta_quest.constants import PLAYER_START_Y
+from quanta_quest.levels import BallSpec, build_scene, load_level
+from quanta_quest.sprites import PlayerCharacter
+
+
+def make_store(specs):
+    level = load_level("main")._replace(balls=tuple(specs), init_ball=0)
+    store = BallStore(level.balls)
+    build_scene(level, PlayerCharacter(), store)
+    return store
+
+
+def spec(state, x, master=None, goal=None, role=None):
+    return BallSpec(state=state, x=x, y=PLAYER_START_Y + 30, master=master, goal=goal, role=role)
+
+
+def test_sprites_read_and_write_through_the_store():
+    store = make_store([spec(0, 64), spec(2, 128, master=0)])
+    store.dirty_set = set()
+    master, target = store.sprites
+
+    target.state = 4
+    assert store.states.tolist() == [0, 4]
+    assert target.master is master and master.master is None
+    store.set_states([0, 1], 4)
+    assert master.state == 4
+    assert store.dirty_set == {master, target}
+
+
+def test_unchanged_states_are_not_marked_dirty():
+    store = make_store([spec(0, 64), spec(2, 128)])
+    store.dirty_set = set()
+    store.set_state(0, 0)
+    store.set_states([0, 1], [0, 2])
+    assert store.dirty_set == set()
+
+
+def test_apply_gate_uses_each_balls_master():
+    store = make_store([spec(4, 64), spec(0, 128, master=0, goal=ENTANGLED_STATE), spec(0, 192)])
+    store.apply_gate(np.arange(3), "C")
+    assert store.states.tolist() == [4, 4, 0]
+    assert store.entangled_mask().tolist() == [False, True, False]
+    assert store.is_entangled_pair(0, 1)
+    assert store.solved()
+
+
+def test_roles_and_groups():
+    store = make_store([
+        spec(0, 64, role="challenge"),
+        spec(0, 128, master=0, role="challenge"),
+        spec(3, 192, master=1),
+        spec(0, 256),
+    ])
+    assert store.with_role("challenge") == store.sprites[:2]
+    assert store.role("teleport_source") is None
+    assert store.group(2).tolist() == [0, 1, 2]
+    assert store.all_equal("challenge")
+
+
+def test_linked_balls_follow_their_joint_state():
+    store = make_store([spec(4, 64), spec(5, 128, master=0), spec(0, 192), spec(0, 256, master=2)])
+    store.dirty_set = set()
+    assert store.gate(1, "C").tolist() == [0]
+    assert store.states.tolist()[:2] == [5, 5]
+    assert store.dirty_set == {store.sprites[0]}
+    assert not store.entangled_mask().any()
+
+    store.gate(2, "H")
+    store.gate(3, "C")
+    assert store.entangled_mask().tolist() == [False, False, False, True]
+    # Setting a state directly ends the entanglement
+    store.set_state(3, 0)
+    assert not store.is_entangled_pair(2, 3)
+
+
+def test_snapshot_restores_entanglement():
+    store = make_store([spec(4, 64), spec(0, 128, master=0)])
+    saved = store.snapshot()
+    store.gate(1, "C")
+    assert store.is_entangled_pair(0, 1)
+    store.restore(saved)
+    assert store.states.tolist() == [4, 0] and not store.is_entangled_pair(0, 1)
@@ -0,0 +1,53 @@
+import arcade
+import pytest
+
+from quanta_quest.chunks import CHUNK_WIDTH, ChunkedScene, chunk_index
+from quanta_quest.engine import GameEngine
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """Count the sprites drawn, since there is no window to draw on."""
+    counts = []
+    monkeypatch.setattr(arcade.SpriteList, "draw", lambda self, **kwargs: counts.append(len(self)))
+    return counts
+
+
+def test_only_chunks_in_view_are_drawn(drawn):
+    engine = GameEngine(seed=1)
+    chunks = ChunkedScene(engine.scene)
+    chunks.set_view(3000, 3000 + CHUNK_WIDTH)
+    chunks.draw()
+
+    assert chunks.first == chunk_index(3000 - chunks.margin)
+    assert chunks.drawn_chunks == sum(
+        index in chunks.chunks for index in range(chunks.first, chunks.last + 1)
+    )
+    assert chunks.drawn_chunks + chunks.culled_chunks == len(chunks.chunks)
+    # The player is drawn on top of the chunked layers
+    assert sum(drawn) == chunks.drawn_sprites + len(engine.scene["Player"])
+
+
+def test_counts_cover_every_visible_sprite(drawn):
+    engine = GameEngine(seed=1)
+    chunks = ChunkedScene(engine.scene)
+    visible = sum(
+        sprite.visible for name in chunks.chunked for sprite in engine.scene[name]
+    )
+    chunks.set_view(0, CHUNK_WIDTH)
+    chunks.draw()
+    assert chunks.drawn_sprites + chunks.culled_sprites == visible
+
+    # A collected gate leaves its chunk with the scene
+    engine.scene["Gates"][-1].remove_from_sprite_lists()
+    chunks.draw()
+    assert chunks.drawn_sprites + chunks.culled_sprites == visible - 1
+
+
+def test_in_view_follows_the_drawn_chunks():
+    engine = GameEngine(seed=1)
+    chunks = ChunkedScene(engine.scene)
+    ball = engine.balls[0]
+    assert chunks.in_view(ball)
+    chunks.set_view(ball.center_x + 4 * CHUNK_WIDTH, ball.center_x + 5 * CHUNK_WIDTH)
+    assert not chunks.in_view(ball)
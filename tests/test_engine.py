@@ -0,0 +1,144 @@
+import arcade
+
+from quanta_quest.balls import (
+    BELL_PARTNER,
+    CHALLENGE,
+    ENTANGLE_MASTER,
+    ENTANGLE_TARGET,
+    ENTANGLED_STATE,
+    TELEPORT_SOURCE,
+    TELEPORT_TARGET,
+)
+from quanta_quest.engine import (
+    CHOICE,
+    GATE_MESSAGES,
+    MESSAGE,
+    SOUND,
+    TELEPORT_CHOICES,
+    TELEPORT_QUESTION,
+    GameEngine,
+    run_script,
+)
+
+ALT = arcade.key.MOD_ALT
+
+
+def messages(events):
+    return [value for kind, value in events if kind == MESSAGE]
+
+
+def touch(engine, ball, *action):
+    """Put the player on ball, give one input and return the events of that tick."""
+    engine.pop_events()
+    engine.player_sprite.position = ball.position
+    run_script([(0, *action)], 1, engine=engine)
+    return engine.pop_events()
+
+
+def walk_right(engine, frames):
+    # The intro message releases the keys, so press again once it is gone
+    script = [(0, "key_press", arcade.key.RIGHT), (5, "key_press", arcade.key.RIGHT)]
+    run_script(script, frames, engine=engine)
+    return engine.pop_events()
+
+
+def test_gate_pickup_message_follows_the_gate_name():
+    engine = GameEngine(seed=1)
+    # Collect the gates out of their level order
+    for gate in sorted(engine.scene["Gates"], key=lambda gate: gate.name):
+        engine.player_sprite.position = gate.position
+        engine.update()
+        assert engine.events[-2:] == [(MESSAGE, GATE_MESSAGES[gate.name]), (SOUND, "coin")]
+        engine.dismiss_message()
+    assert engine.collected_gates == {"X": 2, "Z": 2, "H": 2, "C": 2}
+
+
+def test_walking_right_picks_up_every_gate():
+    engine = GameEngine(seed=1)
+    events = walk_right(engine, 600)
+
+    assert engine.collected_gates == {"X": 2, "Z": 2, "H": 2, "C": 2}
+    assert not engine.scene["Gates"]
+    pickups = [text for text in messages(events) if text in GATE_MESSAGES.values()]
+    assert pickups == [GATE_MESSAGES[name] for name in "XZHC"]
+    assert events.count((SOUND, "coin")) == 4
+
+
+def test_gate_key_without_alt_applies_nothing():
+    engine = GameEngine(seed=1)
+    engine.collected_gates["X"] = 2
+    ball = engine.balls.role(TELEPORT_SOURCE)
+    touch(engine, ball, "key_release", arcade.key.X, 0)
+    assert (ball.state, engine.collected_gates["X"]) == (0, 2)
+
+
+def test_h_then_cnot_entangles_the_pair_and_grants_an_h():
+    engine = GameEngine(seed=1)
+    engine.collected_gates.update(H=1, C=1)
+    master = engine.balls.role(ENTANGLE_MASTER)
+    target = engine.balls.role(ENTANGLE_TARGET)
+
+    touch(engine, master, "key_release", arcade.key.H, ALT)
+    touch(engine, target, "key_release", arcade.key.C, ALT)
+    assert (master.state, target.state) == (ENTANGLED_STATE, ENTANGLED_STATE)
+    assert engine.collected_gates["H"] == 0
+
+    engine.player_sprite.position = (target.center_x + 2 * target.width, target.center_y)
+    run_script([], 1, engine=engine)
+    remarks = messages(engine.pop_events())
+    assert any(text.startswith("Well done!") for text in remarks)
+    assert engine.collected_gates["H"] == 1
+
+
+def test_walking_past_an_unentangled_pair_warns():
+    engine = GameEngine(seed=1)
+    target = engine.balls.role(ENTANGLE_TARGET)
+    engine.player_sprite.position = (target.center_x + 2 * target.width, target.center_y)
+    run_script([], 1, engine=engine)
+    remarks = messages(engine.pop_events())
+    assert any(text.startswith("I don't think you applied the correct operations.") for text in remarks)
+    assert engine.collected_gates["H"] == 0
+
+
+def test_teleportation():
+    engine = GameEngine(seed=1)
+    engine.collected_gates.update(X=1)
+    source = engine.balls.role(TELEPORT_SOURCE)
+
+    # Alt+M does nothing before the source has been flipped
+    events = touch(engine, source, "key_release", arcade.key.M, ALT)
+    assert not any(kind == CHOICE for kind, _ in events)
+    events = touch(engine, source, "key_release", arcade.key.X, ALT)
+    bell = 'Great. The next step is to perform a "Bell measurement"'
+    assert any(text.startswith(bell) for text in messages(events))
+
+    events = touch(engine, source, "key_release", arcade.key.M, ALT)
+    assert (CHOICE, (TELEPORT_QUESTION, TELEPORT_CHOICES)) in events
+    assert source.state == engine.balls.role(BELL_PARTNER).state == ENTANGLED_STATE
+
+    target = engine.balls.role(TELEPORT_TARGET)
+    answer = "X gate" if target.state == 0 else "Z gate"
+    run_script([(0, "answer_teleport", answer)], 1, engine=engine)
+    assert messages(engine.pop_events()) == [
+        "Nicely done! You have successfully teleported the ball. Proceed to complete the game."
+    ]
+    assert target.state in (2, 3)
+
+
+def test_final_challenge():
+    engine = GameEngine(seed=1)
+    engine.collected_gates.update(Z=1, H=1)
+    top, bottom = engine.balls.with_role(CHALLENGE)
+
+    events = touch(engine, top, "key_release", arcade.key.Z, ALT)
+    assert "Oops! That did't work. Try again?" in messages(events)
+    events = touch(engine, top, "key_release", arcade.key.H, ALT)
+    assert "Great! You have finished the game." in messages(events)
+    assert top.state == bottom.state
+
+
+def test_reaching_the_end_of_the_map_ends_the_game():
+    engine = GameEngine(seed=1)
+    engine.player_sprite.center_x = engine.end_of_map + 1
+    run_script([], 10, engine=engine)
+    assert engine.game_over and engine.ticks == 1
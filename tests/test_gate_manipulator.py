@@ -0,0 +1,22 @@
+import numpy as np
+
+from quanta_quest.gate_manipulator import gate_on_state, gates_on_states, verify_transition_table
+
+
+def test_transition_tables_match_the_gate_matrices():
+    assert verify_transition_table() == []
+
+
+def test_cnot_without_master_leaves_the_state():
+    assert [gate_on_state(s, "C") for s in range(8)] == list(range(8))
+
+
+def test_batch_api_matches_gate_on_state():
+    states = np.arange(8)
+    for gate in ("X", "Z", "H", "S"):
+        assert gates_on_states(states, gate).tolist() == [gate_on_state(s, gate) for s in states]
+    for master in range(8):
+        masters = np.full(8, master)
+        expected = [gate_on_state(s, "C", master) for s in states]
+        assert gates_on_states(states, "C", masters).tolist() == expected
+    assert gates_on_states(states, "C", np.full(8, -1)).tolist() == list(range(8))
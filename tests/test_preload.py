@@ -0,0 +1,24 @@
+from quanta_quest.assets import asset_path
+from quanta_quest.balls import BallStore
+from quanta_quest.levels import build_scene, load_level
+from quanta_quest.preload import game_texture_paths
+from quanta_quest.sprites import GAME_TEXTURES, TEXTURES, PlayerCharacter
+
+
+def start_game(level):
+    for path in game_texture_paths(level):
+        TEXTURES.get(path, owner=GAME_TEXTURES)
+    build_scene(level, PlayerCharacter(), BallStore(level.balls))
+
+
+def test_restart_decodes_no_textures_again():
+    level = load_level("main")
+    menu = object()
+    TEXTURES.get(asset_path("ball_white.png"), owner=menu)
+    start_game(level)
+    TEXTURES.release(menu)
+    TEXTURES.evict_idle()
+
+    misses = TEXTURES.stats()["misses"]
+    start_game(level)
+    assert TEXTURES.stats()["misses"] == misses
@@ -0,0 +1,92 @@
+import struct
+
+import arcade
+import pytest
+
+from quanta_quest.engine import GameEngine, run_script
+from quanta_quest.replay import (
+    MAGIC,
+    InputLog,
+    InputRecord,
+    InputRecorder,
+    Replayer,
+    dump_log,
+    parse_log,
+)
+
+
+def session_state(engine):
+    player = engine.player_sprite
+    return (
+        engine.ticks,
+        player.position,
+        engine.balls.states.tolist(),
+        dict(engine.collected_gates),
+        len(engine.scene["Gates"]),
+    )
+
+
+def test_dump_and_parse_round_trip_with_64_bit_keys():
+    log = InputLog(2**63 + 5, "main", [
+        InputRecord(0, "key_press", arcade.key.RIGHT, arcade.key.MOD_ALT),
+        InputRecord(7, "key_release", 0x1E << 32),
+        InputRecord(9, "dismiss_message"),
+        InputRecord(2**32 - 1, "answer_teleport", 2),
+    ])
+    assert parse_log(dump_log(log)) == log
+
+
+def test_version_1_logs_are_read():
+    data = (
+        struct.pack("<4sBQB", MAGIC, 1, 42, 4) + b"main"
+        + struct.pack("<IBIH", 3, 0, arcade.key.LEFT, 0)
+    )
+    assert parse_log(data) == InputLog(42, "main", [InputRecord(3, "key_press", arcade.key.LEFT)])
+
+
+@pytest.mark.parametrize("data, message", [
+    (struct.pack("<4sBQB", b"NOPE", 2, 0, 0), "not a Quanta Quest"),
+    (struct.pack("<4sBQB", MAGIC, 99, 0, 0), "unsupported"),
+    (struct.pack("<4sBQB", MAGIC, 2, 0, 0) + b"\0" * 5, "truncated"),
+])
+def test_bad_logs_are_rejected(data, message):
+    with pytest.raises(ValueError, match=message):
+        parse_log(data)
+
+
+@pytest.fixture(scope="module")
+def session():
+    script = [
+        (0, "key_press", arcade.key.RIGHT),
+        (90, "key_press", arcade.key.UP),
+        (95, "key_release", arcade.key.UP),
+        (200, "key_release", arcade.key.RIGHT),
+        (210, "key_release", arcade.key.H),
+        (260, "key_press", arcade.key.LEFT),
+        (320, "key_release", arcade.key.LEFT),
+    ]
+    engine = GameEngine(seed=12345)
+    recorder = InputRecorder.attach(engine)
+    run_script(script, 400, engine=engine)
+    return engine, parse_log(dump_log(recorder.to_log()))
+
+
+def test_replay_reaches_the_recorded_state(session):
+    engine, log = session
+    replayer = Replayer(log, snapshot_interval=100)
+    replayer.run_to(engine.ticks)
+    assert session_state(replayer.engine) == session_state(engine)
+
+
+def test_seek_back_matches_a_fresh_replay(session):
+    engine, log = session
+    replayer = Replayer(log, snapshot_interval=100)
+    replayer.run_to(engine.ticks)
+    replayer.seek(250)
+    assert sorted(replayer.snapshots) == [0, 100, 200, 300, 400]
+
+    fresh = Replayer(log)
+    fresh.run_to(250)
+    assert session_state(replayer.engine) == session_state(fresh.engine)
+    replayer.seek(engine.ticks)
+    assert session_state(replayer.engine) == session_state(engine)
@@ -0,0 +1,32 @@
+from quanta_quest.constants import TICK_SECONDS
+from quanta_quest.scheduler import FixedTimestep, Timer
+
+
+def test_frames_are_handed_out_in_whole_ticks():
+    timestep = FixedTimestep()
+    assert [timestep.advance(TICK_SECONDS / 2) for _ in range(4)] == [0, 1, 0, 1]
+    assert timestep.advance(3 * TICK_SECONDS) == 3
+    assert timestep.ticks == 5 and not timestep.behind
+
+
+def test_slow_frames_hit_the_cap_and_set_behind():
+    timestep = FixedTimestep(max_steps=5)
+    assert timestep.advance(5 * TICK_SECONDS) == 5
+    assert timestep.behind and timestep.dropped_ticks == 0
+    assert timestep.advance(8 * TICK_SECONDS) == 5
+    assert timestep.dropped_ticks == 3
+    assert timestep.advance(TICK_SECONDS) == 1
+    assert not timestep.behind
+
+
+def test_alpha_is_the_leftover_fraction_of_a_tick():
+    timestep = FixedTimestep()
+    timestep.advance(1.25 * TICK_SECONDS)
+    assert abs(timestep.alpha - 0.25) < 1e-9
+
+
+def test_timer_counts_seconds_in_ticks():
+    timer = Timer(3 * TICK_SECONDS, repeat=True)
+    assert not timer.tick()
+    timer.start()
+    assert [timer.tick() for _ in range(6)] == [False, False, True, False, False, True]
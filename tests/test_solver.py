@@ -0,0 +1,48 @@
+from quanta_quest.gate_manipulator import gate_on_state
+from quanta_quest.levels import load_level
+from quanta_quest.solver import check_level, reachable, shortest_sequence
+
+
+def play(start, steps, masters):
+    states = list(start)
+    for gate, ball in steps:
+        master = None if masters[ball] is None else states[masters[ball]]
+        states[ball] = gate_on_state(states[ball], gate, master)
+    return tuple(states)
+
+
+def test_shortest_sequence_entangles_a_pair():
+    masters = (None, 0)
+    steps = shortest_sequence((0, 0), (4, 4), {"H": 1, "C": 1}, masters)
+    assert steps == (("H", 0), ("C", 1))
+    assert play((0, 0), steps, masters) == (4, 4)
+
+
+def test_shortest_sequence_respects_the_inventory():
+    assert shortest_sequence(0, 2, {"X": 1}) == (("X", 0),)
+    assert shortest_sequence(0, 2, {"H": 5}) is None
+    assert shortest_sequence((0, 0), (4, 4), {"H": 1}, (None, 0)) is None
+
+
+def test_goal_none_matches_any_state():
+    assert shortest_sequence((0, 3), (2, None), (1, 0, 0, 0)) == (("X", 0),)
+
+
+def test_reachable_steps_lead_to_their_states():
+    masters = (None, 0)
+    found = reachable((0, 1), (2, 2, 2, 1), masters)
+    assert found[(0, 1)] == ()
+    for states, steps in found.items():
+        assert play((0, 1), steps, masters) == states
+
+
+def test_extra_gates_past_the_cap_change_nothing():
+    # Dominance pruning and the count cap must not lose any state
+    small = reachable((0, 5), (3, 3, 3, 3), (None, 0))
+    large = reachable((0, 5), (40, 40, 40, 40), (None, 0))
+    assert small.keys() <= large.keys()
+    assert all(len(large[states]) <= len(steps) for states, steps in small.items())
+
+
+def test_main_level_is_solvable():
+    assert check_level(load_level("main")) == []
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quanta_quest.gate_manipulator import LinkedStates, gate_on_state
+from quanta_quest.statevector import QubitRegister, verify_register
+
+
+def test_register_matches_the_transition_tables():
+    assert verify_register() == []
+
+
+def test_from_states_reads_back_exactly():
+    register = QubitRegister.from_states([5, 2, 7])
+    assert [register.qubit_state(q) for q in range(3)] == [5, 2, 7]
+
+
+@pytest.mark.parametrize("gate", ["X", "Z", "H"])
+def test_gate_on_one_qubit_leaves_the_others(gate):
+    states = [5, 2, 7]
+    register = QubitRegister.from_states(states)
+    register.apply_gate(gate, 1)
+    expected = list(states)
+    expected[1] = gate_on_state(states[1], gate)
+    assert [register.qubit_state(q) for q in range(3)] == expected
+
+
+def test_h_then_cnot_entangles():
+    register = QubitRegister.from_states([0, 0])
+    register.apply_gate("H", 0)
+    register.cnot(0, 1)
+    assert register.is_entangled(0) and register.is_entangled(1)
+    assert register.qubit_state(1) is None
+
+
+def test_bell_measurement_leaves_definite_qubits():
+    register = QubitRegister.from_states([4, 0, 0], rng=np.random.default_rng(1))
+    register.apply_gate("H", 1)
+    register.cnot(1, 2)
+    bits = register.bell_measure(0, 1)
+    assert register.qubit_state(0) in (0, 1, 2, 3)
+    assert register.qubit_state(1) in (0, 1, 2, 3)
+    assert [register.qubit_state(q) // 2 for q in (0, 1)] == list(bits)
+    assert not register.is_entangled(2)
+
+
+def test_linked_cnot_on_a_superposed_master_entangles():
+    linked = LinkedStates([0, 2], [None, 0])
+    linked.apply("H", 0)
+    assert linked.apply("C", 1) == [4, 4]
+    assert linked.is_entangled_pair(0, 1)
+
+
+def test_linked_cnot_kicks_a_phase_back_onto_the_master():
+    # |+⟩|-⟩ is left unentangled as |-⟩|-⟩, though both are superposed
+    linked = LinkedStates([4, 5], [None, 0])
+    assert linked.apply("C", 1) == [5, 5]
+    assert not linked.is_entangled_pair(0, 1)
+
+
+def test_linked_states_restore():
+    linked = LinkedStates([4, 0], [None, 0])
+    saved = linked.snapshot()
+    linked.apply("C", 1)
+    linked.restore(saved)
+    assert not linked.is_entangled_pair(0, 1)
+    assert linked.apply("C", 1) == [4, 4]
+    assert linked.is_entangled_pair(0, 1)
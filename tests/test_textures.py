@@ -0,0 +1,51 @@
+from quanta_quest.assets import asset_path
+from quanta_quest.sprites import TextureRegistry
+
+BALLS = [asset_path(f"{name}.png") for name in ("ball_white", "ball_black", "ball_up_up")]
+
+
+def test_get_returns_one_texture_per_path():
+    registry = TextureRegistry()
+    first = registry.get(BALLS[0], owner="a")
+    assert registry.get(BALLS[0], owner="b") is first
+    assert registry.stats()["misses"] == 1
+
+
+def test_release_and_evict_frees_only_unshared_textures():
+    registry = TextureRegistry()
+    for path in BALLS:
+        registry.get(path, owner="view")
+    registry.get(BALLS[0], owner="game")
+
+    registry.release("view")
+    assert registry.stats()["idle"] == 2
+    registry.evict_idle()
+
+    stats = registry.stats()
+    assert (stats["textures"], stats["idle"]) == (1, 0)
+    registry.get(BALLS[0])
+    assert registry.stats()["misses"] == 3
+    registry.get(BALLS[1])
+    assert registry.stats()["misses"] == 4
+
+
+def test_released_texture_is_reused_until_evicted():
+    registry = TextureRegistry()
+    texture = registry.get(BALLS[0], owner="view")
+    registry.release("view")
+    assert registry.get(BALLS[0], owner="view") is texture
+    assert registry.stats()["idle"] == 0
+
+
+def test_idle_pool_drops_least_recently_used_past_max_idle():
+    registry = TextureRegistry(max_idle=1)
+    registry.get(BALLS[0], owner="old")
+    registry.release("old")
+    registry.get(BALLS[1], owner="new")
+    registry.release("new")
+
+    assert registry.stats()["textures"] == 1
+    registry.get(BALLS[1])
+    assert registry.stats()["misses"] == 2
+    registry.get(BALLS[0])
+    assert registry.stats()["misses"] == 3
@@ -0,0 +1,68 @@
+from quanta_quest.triggers import TriggerMap
+
+
+def test_enter_exit_and_while_inside_fire_on_transitions():
+    triggers = TriggerMap()
+    zone = triggers.add_zone(100, 200)
+    calls = []
+    zone.on_enter.append(lambda: calls.append("enter"))
+    zone.on_exit.append(lambda: calls.append("exit"))
+    zone.while_inside.append(lambda: calls.append("inside"))
+
+    for x in (50, 100, 150, 200, 250):
+        triggers.update(x)
+    assert calls == ["enter", "inside", "inside", "exit"]
+    assert not triggers.inside(zone)
+
+
+def test_callback_returning_true_unregisters_and_drops_empty_zone():
+    triggers = TriggerMap()
+    zone = triggers.add_zone(0)
+    calls = []
+    zone.on_enter.append(lambda: calls.append("enter") or True)
+
+    triggers.update(10)
+    triggers.update(-10)
+    triggers.update(10)
+    assert calls == ["enter"]
+    assert zone not in triggers.zones
+
+
+def test_overlapping_zones():
+    triggers = TriggerMap()
+    outer = triggers.add_zone(0, 300)
+    inner = triggers.add_zone(100, 200)
+    for zone in (outer, inner):
+        zone.while_inside.append(lambda: None)
+
+    triggers.update(150)
+    assert triggers.inside(outer) and triggers.inside(inner)
+    triggers.update(250)
+    assert triggers.inside(outer) and not triggers.inside(inner)
+
+
+def test_watchers_run_on_state_changes_until_they_return_true():
+    triggers = TriggerMap()
+    seen = []
+    triggers.watch("ball", lambda ball: seen.append(ball) or len(seen) == 2)
+
+    for _ in range(3):
+        triggers.state_changed("ball")
+    triggers.state_changed("other")
+    assert seen == ["ball", "ball"]
+
+
+def test_restore_brings_back_fired_callbacks():
+    triggers = TriggerMap()
+    zone = triggers.add_zone(0, 100)
+    calls = []
+    zone.on_enter.append(lambda: calls.append("enter") or True)
+    triggers.update(-10)
+    snapshot = triggers.snapshot()
+
+    triggers.update(10)
+    assert zone not in triggers.zones
+    triggers.restore(snapshot)
+    triggers.update(-10)
+    triggers.update(10)
+    assert calls == ["enter", "enter"]
@@ -0,0 +1,174 @@
+"""Rasterize resources/svg into the sprite texture atlas.
+
+Each SVG in SPRITES is rendered at the size the game draws it: the size
+of the PNG it stands in for, times its sprite scaling. The images are
+packed into atlas_<n>.png files in src/quanta_quest/assets, next to an
+atlas.json manifest that TextureRegistry reads at runtime. The manifest
+also records a hash of each source, so --check can tell when the SVGs
+have changed since the atlas was last built.
+
+Needs cairosvg and the cairo library it wraps: pip install cairosvg
+
+Run with: python tools/build_atlas.py [--check]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from quanta_quest.assets import ATLAS_MANIFEST, asset_path
+from quanta_quest.constants import BALL_SCALING, GATE_SCALING
+
+SVG_DIR = Path(__file__).resolve().parent.parent / "resources" / "svg"
+ATLAS_SIZE = 1024
+PADDING = 2
+
+# Packed asset name -> scaling the game draws it at
+SPRITES = {
+    "ball_white.png": BALL_SCALING,
+    "ball_black.png": BALL_SCALING,
+    "ball_up_up.png": BALL_SCALING,
+    "ball_up_down.png": BALL_SCALING,
+    "score_X.png": GATE_SCALING,
+    "score_Z.png": GATE_SCALING,
+    "score_H.png": GATE_SCALING,
+    "score_C.png": GATE_SCALING,
+}
+
+
+def svg_path(name):
+    return SVG_DIR / f"{Path(name).stem}.svg"
+
+
+def target_size(name, scale):
+    """Return the pixel size name is drawn at, from the PNG it replaces."""
+    with Image.open(asset_path(name)) as image:
+        width, height = image.size
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def source_hash(name, scale):
+    """Hash the SVG source together with the size it is rendered at."""
+    digest = hashlib.sha256(svg_path(name).read_bytes())
+    digest.update(repr(target_size(name, scale)).encode())
+    return digest.hexdigest()
+
+
+def rasterize(name, scale):
+    import cairosvg
+
+    width, height = target_size(name, scale)
+    data = cairosvg.svg2png(url=str(svg_path(name)), output_width=width, output_height=height)
+    return Image.open(io.BytesIO(data)).convert("RGBA")
+
+
+def pack(images):
+    """Shelf-pack {name: image} into atlases.
+
+    Returns the atlas images and {name: (atlas index, x, y)}, with x and y
+    the top-left corner of the image in its atlas.
+    """
+    placements = {}
+    atlases = [[]]
+    x = y = shelf = 0
+    for name in sorted(images, key=lambda n: (-images[n].height, n)):
+        width, height = images[name].size
+        if x + width > ATLAS_SIZE:
+            x, y, shelf = 0, y + shelf + PADDING, 0
+        if y + height > ATLAS_SIZE:
+            atlases.append([])
+            x = y = shelf = 0
+        placements[name] = (len(atlases) - 1, x, y)
+        atlases[-1].append(name)
+        x += width + PADDING
+        shelf = max(shelf, height)
+
+    result = []
+    for names in atlases:
+        used = max(placements[n][2] + images[n].height for n in names)
+        atlas = Image.new("RGBA", (ATLAS_SIZE, used))
+        for name in names:
+            atlas.paste(images[name], placements[name][1:])
+        result.append(atlas)
+    return result, placements
+
+
+def rendered_scale(name, image):
+    """Return the scale image was actually rendered at relative to its PNG.
+
+    target_size rounds to whole pixels, so this differs slightly from the
+    sprite scaling; recording it lets the game restore the exact size.
+    """
+    with Image.open(asset_path(name)) as png:
+        return image.width / png.width
+
+
+def write_atlas(images, hashes, out_dir):
+    """Pack images and write the atlas files and manifest to out_dir."""
+    atlases, placements = pack(images)
+    out_dir = Path(out_dir)
+    for old in out_dir.glob("atlas_*.png"):
+        old.unlink()
+    names = []
+    for i, atlas in enumerate(atlases):
+        names.append(f"atlas_{i}.png")
+        atlas.save(out_dir / names[-1], optimize=True)
+    manifest = {
+        "images": names,
+        "regions": {
+            name: {
+                "image": index,
+                "x": x,
+                "y": y,
+                "width": images[name].width,
+                "height": images[name].height,
+                "scale": rendered_scale(name, images[name]),
+            }
+            for name, (index, x, y) in sorted(placements.items())
+        },
+        "sources": hashes,
+    }
+    with open(out_dir / ATLAS_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def stale_sprites():
+    """Return the names whose source changed since the atlas was built."""
+    try:
+        with open(asset_path(ATLAS_MANIFEST), encoding="utf-8") as f:
+            built = json.load(f)["sources"]
+    except FileNotFoundError:
+        return sorted(SPRITES)
+    return sorted(
+        name for name, scale in SPRITES.items() if built.get(name) != source_hash(name, scale)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true", help="exit with status 1 if the atlas is out of date"
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = stale_sprites()
+        for name in stale:
+            print(f"out of date: {name}")
+        return 1 if stale else 0
+
+    images = {name: rasterize(name, scale) for name, scale in SPRITES.items()}
+    hashes = {name: source_hash(name, scale) for name, scale in SPRITES.items()}
+    write_atlas(images, hashes, Path(asset_path(ATLAS_MANIFEST)).parent)
+    print(f"packed {len(images)} sprites into {Path(asset_path(ATLAS_MANIFEST)).parent}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
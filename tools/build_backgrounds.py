@@ -0,0 +1,75 @@
+"""Build the background image variants shipped with the game.
+
+Each source in resources/backgrounds is decoded and hashed by its pixel
+content, so identical images are stored once however many names refer to
+them. Every distinct image is saved as JPEG at each width in
+VARIANT_WIDTHS no larger than the source. The files go to
+src/quanta_quest/assets/backgrounds, and a backgrounds.json manifest maps
+each background name to its variants. At runtime background_path picks
+the smallest variant that covers the window.
+
+Run with: python tools/build_backgrounds.py
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from quanta_quest.assets import BACKGROUND_MANIFEST, asset_path
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "resources" / "backgrounds"
+OUTPUT_DIR = "backgrounds"
+VARIANT_WIDTHS = (1024, 768, 512)
+QUALITY = 90
+
+
+def content_hash(image):
+    """Hash the decoded pixels, so re-encoded copies of one image match."""
+    digest = hashlib.sha256(f"{image.mode} {image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()[:12]
+
+
+def write_variants(image, key, out_dir):
+    """Save the variants of image and return their manifest entries, largest first."""
+    variants = []
+    widths = sorted({min(width, image.width) for width in VARIANT_WIDTHS}, reverse=True)
+    for width in widths:
+        height = round(image.height * width / image.width)
+        variant = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        name = f"{OUTPUT_DIR}/{key}_{width}x{height}.jpg"
+        variant.save(out_dir / name, quality=QUALITY, optimize=True)
+        variants.append({"file": name, "width": width, "height": height})
+    return variants
+
+
+def main():
+    out_dir = Path(asset_path(BACKGROUND_MANIFEST)).parent
+    (out_dir / OUTPUT_DIR).mkdir(exist_ok=True)
+    for old in (out_dir / OUTPUT_DIR).glob("*.jpg"):
+        old.unlink()
+
+    backgrounds = {}
+    variants = {}
+    for source in sorted(SOURCE_DIR.glob("*.png")):
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+        key = content_hash(image)
+        backgrounds[source.name] = key
+        if key not in variants:
+            variants[key] = write_variants(image, key, out_dir)
+        else:
+            print(f"{source.name}: same image as an earlier source, sharing its variants")
+
+    with open(out_dir / BACKGROUND_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"backgrounds": backgrounds, "variants": variants}, f, indent=2)
+        f.write("\n")
+    print(f"wrote {sum(map(len, variants.values()))} variants of {len(variants)} images")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())